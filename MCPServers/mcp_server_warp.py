@@ -4,15 +4,28 @@ Warp-compatible MCP Server for Financial Command Center AI
 This is a Warp-compatible version of the Financial Command Center MCP server.
 """
 import asyncio
+import atexit
+import functools
+import importlib.util
 import json
+import ssl
 import sys
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 import httpx
 import os
 from datetime import datetime
 from mcp.server.fastmcp import FastMCP
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -20,57 +33,101 @@ logger = logging.getLogger(__name__)
 # Create FastMCP app for Warp compatibility
 app = FastMCP("financial-command-center-warp")
 
+_SERVER_URL = os.getenv('FCC_SERVER_URL', 'https://127.0.0.1:8000')
+_API_KEY = os.getenv('FCC_API_KEY', 'claude-desktop-integration')
+_API_KEY_SET = bool(os.getenv('FCC_API_KEY'))
+
+# Environment is fixed for the life of the process, so ping reports this as-is
+_ENVIRONMENT_CHECK = {
+    "fcc_server_url": _SERVER_URL,
+    "fcc_api_key_set": _API_KEY_SET
+}
+
+# SSL verification stays disabled by default, as before, since the FCC server
+# usually runs with a self-signed certificate; set FCC_VERIFY_TLS=true to turn
+# it on. Either way the context is built once and shared by the pool, and
+# session tickets stay enabled so reconnects can resume instead of doing a
+# full handshake.
+_VERIFY_TLS = os.getenv('FCC_VERIFY_TLS', 'false').lower() == 'true'
+_VERIFY = ssl.create_default_context()
+if not _VERIFY_TLS:
+    _VERIFY.check_hostname = False
+    _VERIFY.verify_mode = ssl.CERT_NONE
+_VERIFY.options &= ~ssl.OP_NO_TICKET
+
+# HTTP/2 multiplexes concurrent requests over one connection but needs the
+# optional h2 package; fall back to HTTP/1.1 keep-alive without it.
+_HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+# Auth headers never change, so build them once for the shared client
+_HEADERS = httpx.Headers({
+    'Authorization': f'Bearer {_API_KEY}',
+    'Content-Type': 'application/json',
+    'Accept': 'application/json'
+})
+
+@functools.lru_cache(maxsize=32)
+def _url(endpoint: str) -> str:
+    """Join the server URL with one of the tools' fixed endpoints"""
+    return f"{_SERVER_URL}{endpoint}"
+
+# Shared, pooled HTTP client. Each tool does a single round-trip, so a sync
+# client keeps the connection pool warm without any event-loop bookkeeping.
+# httpx is kept over aiohttp on purpose: aiohttp sessions are bound to one
+# event loop, which is exactly the per-call lifecycle problem this avoids.
+_SYNC_CLIENT = httpx.Client(
+    verify=_VERIFY,
+    http2=_HTTP2_AVAILABLE,
+    timeout=30.0,
+    headers=_HEADERS,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=60.0),
+)
+atexit.register(_SYNC_CLIENT.close)
+
+# Returned whenever the server is unreachable; callers get a copy
+_CONN_FAIL = {
+    "error": f"Cannot connect to Financial Command Center at {_SERVER_URL}. Make sure the server is running.",
+    "status": "connection_failed"
+}
+
 class FinancialCommandCenterClient:
     def __init__(self):
-        self.server_url = os.getenv('FCC_SERVER_URL', 'https://127.0.0.1:8000')
-        self.api_key = os.getenv('FCC_API_KEY', 'claude-desktop-integration')
-        self.client = None
-        
-    async def setup_client(self):
-        """Setup HTTP client with SSL verification disabled for localhost"""
-        if not self.client:
-            self.client = httpx.AsyncClient(
-                verify=False,  # Disable SSL verification for localhost
-                timeout=30.0,
-                headers={
-                    'Authorization': f'Bearer {self.api_key}',
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json'
-                }
-            )
+        self.server_url = _SERVER_URL
+        self.api_key = _API_KEY
+        self.client = _SYNC_CLIENT
     
-    async def call_api(self, endpoint: str, method: str = 'GET', data: Dict = None):
+    def call_api(self, endpoint: str, method: str = 'GET', data: Dict = None, params: Optional[Dict] = None):
         """Make API call to Financial Command Center"""
         try:
-            await self.setup_client()
-            
-            url = f"{self.server_url}{endpoint}"
-            logger.info(f"Calling {method} {url}")
+            url = _url(endpoint)
+            logger.info("Calling %s %s", method, url)
             
             if method == 'GET':
-                response = await self.client.get(url)
+                response = self.client.get(url, params=params)
             elif method == 'POST':
-                response = await self.client.post(url, json=data)
+                if ORJSON_AVAILABLE:
+                    # Content-Type is already set on the shared client headers
+                    response = self.client.post(url, content=orjson.dumps(data))
+                else:
+                    response = self.client.post(url, json=data)
             else:
                 raise ValueError(f"Unsupported method: {method}")
             
-            response.raise_for_status()
+            if response.status_code >= 400:
+                logger.error("HTTP error %s for %s", response.status_code, url)
+                return {
+                    "error": f"HTTP {response.status_code}: {response.text}",
+                    "status": "http_error"
+                }
+            if ORJSON_AVAILABLE:
+                return orjson.loads(response.content)
             return response.json()
             
         except httpx.ConnectError as e:
-            logger.error(f"Connection failed to {self.server_url}: {e}")
-            return {
-                "error": f"Cannot connect to Financial Command Center at {self.server_url}. Make sure the server is running.",
-                "status": "connection_failed"
-            }
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error {e.response.status_code}: {e}")
-            return {
-                "error": f"HTTP {e.response.status_code}: {e.response.text}",
-                "status": "http_error"
-            }
+            logger.error("Connection failed to %s: %s", self.server_url, e)
+            return _CONN_FAIL.copy()
         except Exception as e:
-            logger.error(f"API call failed: {e}")
+            logger.error("API call failed: %s", e)
             return {
                 "error": str(e),
                 "status": "unknown_error"
@@ -79,60 +136,78 @@ class FinancialCommandCenterClient:
 # Global client instance
 fcc_client = FinancialCommandCenterClient()
 
+# Long-lived worker threads that run the blocking client calls, so FastMCP's
+# event loop stays free to serve other tool calls concurrently
+_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='fcc-mcp')
+atexit.register(_POOL.shutdown, wait=False)
+
+async def _run(func, *args):
+    """Run a blocking call on the shared worker pool"""
+    return await asyncio.get_running_loop().run_in_executor(_POOL, func, *args)
+
+# Short-lived cache for idempotent GETs that the assistant tends to poll
+_CACHE: Dict[str, tuple] = {}
+_CACHE_LOCK = threading.Lock()
+
+def cached_call(endpoint: str, ttl: float = 5.0, force_refresh: bool = False) -> Dict[str, Any]:
+    """GET an endpoint, reusing a response fetched less than ttl seconds ago"""
+    if not force_refresh:
+        with _CACHE_LOCK:
+            entry = _CACHE.get(endpoint)
+        if entry and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+
+    result = fcc_client.call_api(endpoint)
+    # Failures are not cached so the next call retries the server
+    if not (isinstance(result, dict) and 'error' in result):
+        with _CACHE_LOCK:
+            _CACHE[endpoint] = (time.monotonic(), result)
+    return result
+
 @app.tool()
-def get_financial_health() -> Dict[str, Any]:
+async def get_financial_health(force_refresh: bool = False) -> Dict[str, Any]:
     """Get overall financial health and system status"""
-    async def _get_health():
-        return await fcc_client.call_api('/health')
-    
-    return asyncio.run(_get_health())
+    return await _run(cached_call, '/health', 2.0, force_refresh)
 
 @app.tool()
-def get_invoices(status: Optional[str] = None, amount_min: Optional[float] = None, customer: Optional[str] = None) -> Dict[str, Any]:
+async def get_invoices(status: Optional[str] = None, amount_min: Optional[float] = None, customer: Optional[str] = None) -> Dict[str, Any]:
     """Get invoices with optional filtering"""
-    async def _get_invoices():
-        filters = {}
-        if status:
-            filters['status'] = status
-        if amount_min is not None:
-            filters['amount_min'] = amount_min
-        if customer:
-            filters['customer'] = customer
-            
-        endpoint = '/api/invoices'
-        if filters:
-            params = '&'.join([f"{k}={v}" for k, v in filters.items()])
-            endpoint += f"?{params}"
-        return await fcc_client.call_api(endpoint)
-    
-    return asyncio.run(_get_invoices())
+    filters = {
+        k: v for k, v in (('status', status), ('amount_min', amount_min), ('customer', customer))
+        if v is not None and v != ''
+    }
+    return await _run(functools.partial(fcc_client.call_api, '/api/invoices', params=filters or None))
 
 @app.tool()
-def get_contacts(search_term: Optional[str] = None) -> Dict[str, Any]:
+async def get_contacts(search_term: Optional[str] = None) -> Dict[str, Any]:
     """Get customer/supplier contacts"""
-    async def _get_contacts():
-        endpoint = '/api/contacts'
-        if search_term:
-            endpoint += f"?search={search_term}"
-        return await fcc_client.call_api(endpoint)
-    
-    return asyncio.run(_get_contacts())
+    params = {'search': search_term} if search_term else None
+    return await _run(functools.partial(fcc_client.call_api, '/api/contacts', params=params))
 
 @app.tool()
-def get_financial_dashboard() -> Dict[str, Any]:
+async def get_financial_dashboard(force_refresh: bool = False) -> Dict[str, Any]:
     """Get financial dashboard data"""
-    async def _get_dashboard():
-        return await fcc_client.call_api('/api/dashboard')
-    
-    return asyncio.run(_get_dashboard())
+    return await _run(cached_call, '/api/dashboard', 10.0, force_refresh)
 
 @app.tool()
-def get_cash_flow() -> Dict[str, Any]:
+async def get_cash_flow(force_refresh: bool = False) -> Dict[str, Any]:
     """Get cash flow information"""
-    async def _get_cash_flow():
-        return await fcc_client.call_api('/api/cash-flow')
-    
-    return asyncio.run(_get_cash_flow())
+    return await _run(cached_call, '/api/cash-flow', 15.0, force_refresh)
+
+@app.tool()
+async def get_overview(force_refresh: bool = False) -> Dict[str, Any]:
+    """Get health, dashboard and cash flow data in a single call"""
+    # The shared client is thread-safe, so the three requests overlap on its pool
+    health, dashboard, cash_flow = await asyncio.gather(
+        get_financial_health(force_refresh),
+        get_financial_dashboard(force_refresh),
+        get_cash_flow(force_refresh)
+    )
+    return {
+        "health": health,
+        "dashboard": dashboard,
+        "cash_flow": cash_flow
+    }
 
 @app.tool()
 def ping() -> Dict[str, Any]:
@@ -141,11 +216,15 @@ def ping() -> Dict[str, Any]:
         "server": "financial-command-center-warp",
         "timestamp": datetime.now().isoformat(),
         "status": "ready",
-        "environment_check": {
-            "fcc_server_url": os.getenv('FCC_SERVER_URL', 'https://127.0.0.1:8000'),
-            "fcc_api_key_set": bool(os.getenv('FCC_API_KEY'))
-        }
+        "environment_check": dict(_ENVIRONMENT_CHECK)
     }
 
 if __name__ == "__main__":
+    # uvloop speeds up FastMCP's event loop where available (not on Windows)
+    if sys.platform != 'win32':
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
     app.run()
\ No newline at end of file
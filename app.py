@@ -1,40 +1,38 @@
 # enhanced_app.py - Building on your existing app.py with security
+import functools
+import hashlib
+import importlib
+import importlib.util
+import logging
 import os
-import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
 from flask import Flask, session, redirect, url_for, jsonify, request, render_template, render_template_string
 from datetime import datetime
-import json
 
 # Demo mode manager and mock data
 from demo_mode import DemoModeManager, mock_stripe_payment
-import xero_demo_data
-import plaid_demo_data
 
-from ui.helpers import build_nav, format_timestamp, summarize_details
-from ui.dashboard import build_admin_dashboard_context
+from ui.helpers import build_nav, cached_url_for, current_year, format_timestamp, prefers_html, static_url, summarize_details, wants_json
+from ui.dashboard import build_admin_dashboard_context, build_demo_key_commands
 from ui.health import render_health_dashboard
+from orjson_provider import OrjsonProvider
+from jinja2 import FileSystemBytecodeCache
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
 
 
 
-# Xero imports (optional when in live mode)
-try:
-    from xero_oauth import init_oauth
-    from xero_python.accounting import AccountingApi
-    from xero_python.api_client import ApiClient, Configuration
-    from xero_python.api_client.oauth2 import OAuth2Token
-    from xero_python.exceptions import AccountingBadRequestException
-    from xero_python.identity import IdentityApi
-    from xero_python.api_client import serialize
-    XERO_SDK_AVAILABLE = True
-except Exception:
-    XERO_SDK_AVAILABLE = False
-from xero_client import save_token_and_tenant
+# Xero SDK is only needed in live mode; check for it without importing it
+XERO_SDK_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ('xero_python', 'authlib'))
 
 # Import enhanced session configuration
 from session_config import configure_flask_sessions
 
 # Add our security layer
-sys.path.append('.')
 try:
     from auth.security import SecurityManager, require_api_key, log_transaction
     SECURITY_ENABLED = True
@@ -52,17 +50,36 @@ except ImportError:
             return f(*args, **kwargs)
         return wrapper
     
+    _tx_logger = logging.getLogger('fcc.transactions')
+    _tx_logger.addHandler(logging.NullHandler())
+
     def log_transaction(operation, amount, currency, status):
-        print(f"Transaction: {operation} - {amount} {currency} - {status}")
+        _tx_logger.info("Transaction: %s - %s %s - %s", operation, amount, currency, status)
 
 app = Flask(__name__)
+app.json_provider_class = OrjsonProvider
+app.json = OrjsonProvider(app)
+# Persist compiled templates so fresh workers skip Jinja's parse/compile step
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+# Static assets are referenced through static_url(), whose ?v= content hash
+# changes whenever the file does, so browsers may keep them for a year
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
+app.add_template_global(static_url)
+
+# Compress HTML/JSON/JS responses (brotli when the client accepts it, else
+# gzip); the pages are mostly repetitive markup and shrink 5-10x
+if Compress is not None:
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 512
+    app.config['COMPRESS_LEVEL'] = 6
+    Compress(app)
 
 @app.context_processor
 def inject_layout_defaults():
     return {
         'brand_name': 'Financial Command Center AI',
-        'brand_url': url_for('index'),
-        'current_year': datetime.now().year,
+        'brand_url': cached_url_for('index'),
+        'current_year': current_year(),
     }
 
 
@@ -73,6 +90,16 @@ demo = DemoModeManager(app)
 app.config['XERO_CLIENT_ID'] = os.getenv('XERO_CLIENT_ID', 'YOUR_CLIENT_ID')     
 app.config['XERO_CLIENT_SECRET'] = os.getenv('XERO_CLIENT_SECRET', 'YOUR_CLIENT_SECRET')
 
+# Provider credentials are read once at import; the request handlers only
+# check these constants
+STRIPE_API_KEY = os.getenv("STRIPE_API_KEY")
+PLAID_CLIENT_ID = os.getenv("PLAID_CLIENT_ID")
+PLAID_SECRET = os.getenv("PLAID_SECRET")
+PLAID_ACCESS_TOKEN = os.getenv("PLAID_ACCESS_TOKEN")
+PLAID_READY = all((PLAID_CLIENT_ID, PLAID_SECRET, PLAID_ACCESS_TOKEN))
+# Per-request network timeout for the provider SDKs, in seconds
+PROVIDER_TIMEOUT = 8.0
+
 # Initialize security manager if available
 if SECURITY_ENABLED:
     security = SecurityManager()
@@ -94,6 +121,10 @@ if not demo.is_demo:
         if not XERO_SDK_AVAILABLE:
             raise RuntimeError("Xero SDK not available. Install dependencies or enable demo mode.")
 
+        from xero_oauth import init_oauth
+        from xero_python.api_client import ApiClient, Configuration
+        from xero_python.api_client.oauth2 import OAuth2Token
+
         api_client = ApiClient(Configuration(
             oauth2_token=OAuth2Token(
                 client_id=app.config['XERO_CLIENT_ID'],
@@ -133,14 +164,15 @@ else:
 
 # NEW: Health check endpoint (no auth required)
 
-@app.route('/health', methods=['GET'])
-def health_check():
-    """Health check endpoint - returns JSON for API clients or HTML for browsers"""
+@functools.lru_cache(maxsize=2)
+def _health_snapshot(bucket):
+    """Health payload, its JSON body and ETag, shared by every request in one second."""
+    now = datetime.now()
     health_data = {
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now.isoformat(),
         'version': '2.0.0',
-        'mode': 'demo' if 'demo' in demo.get_mode() else 'live',
+        'mode': 'demo' if demo.is_demo else 'live',
         'security': 'enabled' if SECURITY_ENABLED else 'disabled',
         'integrations': {
             'xero': 'configured',
@@ -152,195 +184,30 @@ def health_check():
     # Add session health if available
     if session_config:
         health_data['session_config'] = session_config.health_check()
-    
-    # Check if request wants HTML (browser) or JSON (API)
-    if 'text/html' in request.headers.get('Accept', '') and 'application/json' not in request.args:
-        return render_health_dashboard(health_data, security_enabled=SECURITY_ENABLED, session_config=session_config)
-    
-    return jsonify(health_data)
-
-
-def render_health_dashboard(health_data):
-    """Render the health dashboard using the shared Shadcn layout."""
-    nav_items = build_nav('health')
-
-    status_map = {
-        'healthy': {
-            'label': 'Operational',
-            'message': 'All services are responding normally.',
-            'icon': 'heart-pulse',
-            'tone': 'success',
-        },
-        'warning': {
-            'label': 'Attention needed',
-            'message': 'Some services reported warnings. Review the details below.',
-            'icon': 'alert-triangle',
-            'tone': 'warning',
-        },
-        'error': {
-            'label': 'Service disruption',
-            'message': 'Critical issues detected. Investigate immediately.',
-            'icon': 'octagon-alert',
-            'tone': 'danger',
-        },
-    }
 
-    status = status_map.get(health_data.get('status'), status_map['healthy'])
+    # Pollers get a 304 until something other than the timestamp changes
+    stable = {key: value for key, value in health_data.items() if key != 'timestamp'}
+    etag = hashlib.blake2b(app.json.dumps(stable).encode('utf-8'), digest_size=8).hexdigest()
+    return now, health_data, jsonify(health_data).get_data(), etag
 
-    timestamp = health_data.get('timestamp')
-    observed_display = timestamp
-    if timestamp:
-        try:
-            observed = datetime.fromisoformat(timestamp)
-            observed_display = observed.strftime('%b %d, %Y at %I:%M %p')
-        except Exception:
-            observed_display = timestamp
-
-    mode_value = health_data.get('mode', 'demo')
-    mode_label = 'Demo data' if mode_value == 'demo' else 'Live data'
-    security_flag = health_data.get('security') == 'enabled'
-
-    metrics = [
-        {
-            'label': 'Operating mode',
-            'value': mode_label,
-            'description': 'Switch between demo and production in the admin area.',
-            'icon': 'sparkles' if mode_value == 'demo' else 'shield-check',
-            'tone': 'warning' if mode_value == 'demo' else 'success',
-        },
-        {
-            'label': 'Security layer',
-            'value': 'Enabled' if security_flag or SECURITY_ENABLED else 'Disabled',
-            'description': 'API key enforcement and audit logging protect sensitive endpoints.' if security_flag or SECURITY_ENABLED else 'Install auth/security.py to enable API key enforcement.',
-            'icon': 'shield',
-            'tone': 'success' if security_flag or SECURITY_ENABLED else 'danger',
-            'meta': ['Audit logging', 'Rate limits'] if security_flag or SECURITY_ENABLED else ['Configuration required'],
-        },
-        {
-            'label': 'Connected services',
-            'value': 'Stripe | Plaid | Xero',
-            'description': 'Pre-wired connectors ready for show-time demos.',
-            'icon': 'layers',
-            'tone': 'info',
-        },
-    ]
-
-    session_info = health_data.get('session_config') or {}
-    session_details = []
-    for key, label in (
-        ('status', 'Status'),
-        ('backend', 'Backend'),
-        ('storage_path', 'Storage path'),
-        ('interface', 'Interface'),
-        ('timeout', 'Timeout (s)'),
-    ):
-        if key in session_info and session_info[key] not in (None, ''):
-            value = session_info[key]
-            if key == 'timeout' and isinstance(value, (int, float)):
-                value = f"{int(value)} s"
-            session_details.append({'label': label, 'value': value})
-
-    session_card = {
-        'backend': session_info.get('backend'),
-        'summary': (session_info.get('status') or 'Not configured').title() if session_info else 'Not configured',
-        'message': session_info.get('message') or 'Flask session settings and storage health.',
-        'details': session_details,
-    }
-    if app.config.get('DEBUG'):
-        session_card.setdefault('actions', []).append({
-            'label': 'Inspect session data',
-            'href': url_for('debug_session_info'),
-            'icon': 'bug',
-        })
 
-    certificate = {
-        'status_label': 'Manual review',
-        'message': 'SSL management not available.',
-        'summary': 'Not detected',
-        'details': [],
-    }
-    try:
-        from cert_manager import CertificateManager
-
-        cert_manager = CertificateManager()
-        cert_health = cert_manager.health_check()
-        if cert_health:
-            valid = bool(cert_health.get('certificate_valid'))
-            expires = cert_health.get('expires') or 'unknown'
-            hosts = ', '.join(cert_health.get('hostnames', [])) or 'localhost'
-            certificate['status_label'] = 'Valid' if valid else 'Attention'
-            certificate['message'] = 'Trusted certificates are ready for local HTTPS.' if valid else 'Certificates will regenerate automatically at launch.'
-            certificate['summary'] = f"Valid until {expires}"
-            certificate['details'] = [
-                f"Valid: {'Yes' if valid else 'No'}",
-                f"Hosts: {hosts}",
-            ]
-            if cert_health.get('last_renewed'):
-                certificate['details'].append(f"Last renewed: {cert_health['last_renewed']}")
-    except Exception:
-        pass
-
-    integration_cards = []
-    integration_info = health_data.get('integrations') or {}
-    badge_classes = {
-        'success': 'text-emerald-600',
-        'warning': 'text-amber-600',
-        'danger': 'text-rose-600',
-        'info': 'text-sky-600',
-    }
-    integration_descriptions = {
-        'xero': 'Invoices, contacts, and financial reports.',
-        'stripe': 'Payments, subscriptions, and billing flows.',
-        'plaid': 'Banking connections and transaction monitoring.',
-    }
+@app.route('/health', methods=['GET'])
+def health_check():
+    """Health check endpoint - returns JSON for API clients or HTML for browsers"""
+    now, health_data, body, etag = _health_snapshot(int(time.time()))
 
-    for key, value in integration_info.items():
-        name = key.replace('_', ' ').title()
-        normalized = str(value).lower()
-        if normalized in {'configured', 'connected', 'available', 'ready'}:
-            tone = 'success'
-            status_label = 'Configured'
-            icon = 'check'
-        elif normalized in {'demo', 'optional'}:
-            tone = 'info'
-            status_label = normalized.title()
-            icon = 'sparkles'
-        elif normalized in {'warning', 'degraded', 'pending'}:
-            tone = 'warning'
-            status_label = normalized.title()
-            icon = 'alert-triangle'
-        else:
-            tone = 'danger'
-            status_label = normalized.title() if normalized else 'Unavailable'
-            icon = 'x-circle'
-
-        integration_cards.append({
-            'category': 'Integration',
-            'title': name,
-            'status_label': status_label,
-            'icon': icon,
-            'badge_class': badge_classes.get(tone, 'text-muted-foreground'),
-            'description': integration_descriptions.get(key, ''),
-            'details': [],
-        })
+    # Check if request wants HTML (browser) or JSON (API)
+    if prefers_html() and 'application/json' not in request.args:
+        return render_health_dashboard(health_data, security_enabled=SECURITY_ENABLED, session_config=session_config, observed_at=now)
 
-    health_json = json.dumps(health_data, indent=2, sort_keys=True)
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype=app.json.mimetype)
+    response.set_etag(etag, weak=True)
+    response.cache_control.max_age = 10
+    return response
 
-    return render_template(
-        'health.html',
-        nav_items=nav_items,
-        status=status,
-        metrics=metrics,
-        mode_label=mode_label,
-        security_enabled=security_flag or SECURITY_ENABLED,
-        observed_display=observed_display,
-        request_host=request.host,
-        session_card=session_card,
-        certificate=certificate,
-        integration_cards=integration_cards,
-        health_data=health_data,
-        health_json=health_json,
-    )
 
 @app.route('/admin/dashboard')
 def admin_dashboard():
@@ -358,23 +225,7 @@ def create_demo_key():
         return "Security module not available. Install cryptography and create auth/security.py", 500
 
     demo_key = security.generate_api_key("Web Demo Client", ["read", "write"])
-
-    commands = [
-        {
-            'title': 'Test authentication',
-            'snippet': f"curl -H \"X-API-Key: {demo_key}\" https://127.0.0.1:8000/api/ping",
-        },
-        {
-            'title': 'Fetch Xero contacts',
-            'snippet': f"curl -H \"X-API-Key: {demo_key}\" https://127.0.0.1:8000/api/xero/contacts",
-        },
-        {
-            'title': 'Create demo payment',
-            'snippet': ("curl -X POST -H \"X-API-Key: {demo_key}\" -H \"Content-Type: application/json\" \\" +
-                        " -d '{\\\"amount\\\": 25.50, \\\"description\\\": \\\"Test payment\\\"}'" +
-                        " https://127.0.0.1:8000/api/stripe/payment"),
-        },
-    ]
+    commands = build_demo_key_commands(demo_key)
 
     return render_template(
         'admin/demo_key.html',
@@ -383,115 +234,277 @@ def create_demo_key():
         commands=commands,
     )
 
-@app.route('/api/dashboard', methods=['GET'])
-def get_dashboard():
-    """Get comprehensive financial dashboard data from real sources"""
-    accept_header = request.headers.get('Accept', '')
-    wants_json = 'application/json' in accept_header or request.args.get('format') == 'json'
-
-    if not wants_json:
-        return "Dashboard endpoint - use Accept: application/json header", 400
-
-    # Import the Xero dashboard function
+@functools.lru_cache(maxsize=None)
+def _import_optional(name):
+    """Import an optional SDK once; a failed import is remembered as its message."""
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        return str(e)
+
+
+def _load_sdk(name):
+    """Return an optional SDK module, raising ImportError if it isn't installed."""
+    module = _import_optional(name)
+    if isinstance(module, str):
+        raise ImportError(module)
+    return module
+
+
+# Provider clients are built once and reused so requests share their
+# connection pools instead of paying a fresh TLS handshake each time
+_stripe_module = None
+_plaid_client = None
+_client_lock = threading.Lock()
+
+
+def get_stripe():
+    """Return the stripe module with its API key configured."""
+    global _stripe_module
+    if _stripe_module is None:
+        with _client_lock:
+            if _stripe_module is None:
+                stripe = _load_sdk('stripe')
+                stripe.api_key = STRIPE_API_KEY
+                stripe.default_http_client = stripe.new_default_http_client(timeout=PROVIDER_TIMEOUT)
+                _stripe_module = stripe
+    return _stripe_module
+
+
+def get_plaid_client():
+    """Return a shared PlaidApi client for the configured credentials."""
+    global _plaid_client
+    if _plaid_client is None:
+        with _client_lock:
+            if _plaid_client is None:
+                plaid = _load_sdk('plaid')
+                plaid_api = _load_sdk('plaid.api.plaid_api')
+                cfg = plaid.Configuration(
+                    host=plaid.Environment.Sandbox,  # Change to Production for live data
+                    api_key={
+                        "clientId": PLAID_CLIENT_ID,
+                        "secret": PLAID_SECRET
+                    }
+                )
+                _plaid_client = plaid_api.PlaidApi(plaid.ApiClient(cfg))
+    return _plaid_client
+
+
+def _fetch_xero_dashboard():
     try:
-        from xero_mcp import xero_dashboard
-        xero_data = xero_dashboard()
+        return _load_sdk('xero_mcp').xero_dashboard()
     except Exception as e:
-        xero_data = {"error": f"Failed to fetch Xero data: {str(e)}"}
+        return {"error": f"Failed to fetch Xero data: {str(e)}"}
 
-    # Get real data from Stripe if available
-    stripe_data = {}
+
+def _fetch_stripe_data():
     try:
-        import stripe
-        if os.getenv("STRIPE_API_KEY"):
-            stripe.api_key = os.getenv("STRIPE_API_KEY")
+        # A missing SDK is reported as an error even when Stripe isn't configured
+        _load_sdk('stripe')
+        if STRIPE_API_KEY:
+            stripe = get_stripe()
             # Get recent charges
             charges = stripe.Charge.list(limit=10)
-            stripe_data = {
+            return {
                 "charges": [{"id": c["id"], "amount": c["amount"], "currency": c["currency"], "paid": c["paid"], "created": c["created"]} for c in charges.get("data", [])],
                 "status": "connected"
             }
-        else:
-            stripe_data = {"status": "not_configured"}
+        return {"status": "not_configured"}
     except Exception as e:
-        stripe_data = {"status": "error", "error": str(e)}
+        return {"status": "error", "error": str(e)}
 
-    # Get real data from Plaid if available
-    plaid_data = {}
+
+def _fetch_plaid_data():
     try:
-        import plaid
-        from plaid.api import plaid_api
-        if os.getenv("PLAID_CLIENT_ID") and os.getenv("PLAID_SECRET") and os.getenv("PLAID_ACCESS_TOKEN"):
-            cfg = plaid.Configuration(
-                host=plaid.Environment.Sandbox,  # Change to Production for live data
-                api_key={
-                    "clientId": os.getenv("PLAID_CLIENT_ID"),
-                    "secret": os.getenv("PLAID_SECRET")
-                }
-            )
-            client = plaid_api.PlaidApi(plaid.ApiClient(cfg))
-            from plaid.model.accounts_balance_get_request import AccountsBalanceGetRequest
-            req = AccountsBalanceGetRequest(access_token=os.getenv("PLAID_ACCESS_TOKEN"))
-            balances = client.accounts_balance_get(req).to_dict()
-            plaid_data = {
+        # A missing SDK is reported as an error even when Plaid isn't configured
+        _load_sdk('plaid')
+        if PLAID_READY:
+            client = get_plaid_client()
+            AccountsBalanceGetRequest = _load_sdk('plaid.model.accounts_balance_get_request').AccountsBalanceGetRequest
+            req = AccountsBalanceGetRequest(access_token=PLAID_ACCESS_TOKEN)
+            balances = client.accounts_balance_get(req, _request_timeout=PROVIDER_TIMEOUT).to_dict()
+            return {
                 "accounts": balances.get("accounts", []),
                 "status": "connected"
             }
-        else:
-            plaid_data = {"status": "not_configured"}
+        return {"status": "not_configured"}
     except Exception as e:
-        plaid_data = {"status": "error", "error": str(e)}
+        return {"status": "error", "error": str(e)}
+
+
+# API timestamps only need one-second resolution, so format each second once
+_iso_second = (0, '')
+
+
+def _iso_now():
+    """datetime.now().isoformat(), truncated to the second and cached for it."""
+    global _iso_second
+    second, text = _iso_second
+    now = int(time.time())
+    if now != second:
+        text = datetime.fromtimestamp(now).isoformat()
+        _iso_second = (now, text)
+    return text
+
+
+class DashboardService:
+    """One coherent Xero/Stripe/Plaid snapshot shared by the API routes.
+
+    The three providers are independent network round-trips, so a refresh runs
+    them side by side and waits for the slowest rather than their sum. The
+    result is reused for ``ttl`` seconds; concurrent misses wait on the same
+    refresh instead of each fanning out to every provider.
+
+    Each provider has its own single-worker pool, and a call that outlived the
+    previous deadline is waited on again rather than resubmitted, so a hung
+    provider holds at most one thread and cannot starve the others. The lock
+    only guards bookkeeping and is never held while a provider is called.
+    """
+
+    def __init__(self, ttl=15.0, timeout=PROVIDER_TIMEOUT, providers=None):
+        self.ttl = ttl
+        self.timeout = timeout
+        self._providers = providers or {
+            'xero': _fetch_xero_dashboard,
+            'stripe': _fetch_stripe_data,
+            'plaid': _fetch_plaid_data,
+        }
+        self._pools = {
+            name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'dash-{name}')
+            for name in self._providers
+        }
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._refresh = None
+        self._snapshot = None
+        self._fetched_at = 0.0
+
+    def snapshot(self):
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._fetched_at < self.ttl:
+                return self._snapshot
+            refresh = self._refresh
+            if refresh is None:
+                refresh = self._refresh = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return refresh.result()
+
+        try:
+            snapshot = self._fetch()
+        except BaseException as e:
+            with self._lock:
+                self._refresh = None
+            refresh.set_exception(e)
+            raise
+        with self._lock:
+            self._snapshot = snapshot
+            self._fetched_at = time.monotonic()
+            self._refresh = None
+        refresh.set_result(snapshot)
+        return snapshot
+
+    def _fetch(self):
+        # Only the refresh owner gets here, so _pending needs no lock
+        futures = {}
+        for name, fetch in self._providers.items():
+            future = self._pending.get(name)
+            if future is None or future.done():
+                future = self._pending[name] = self._pools[name].submit(fetch)
+            futures[name] = future
+        deadline = time.monotonic() + self.timeout
+        snapshot = {name: self._result(future, deadline) for name, future in futures.items()}
+        snapshot['fetched_at'] = _iso_now()
+        return snapshot
+
+    def _result(self, future, deadline):
+        # One provider failing or stalling must not take the others down with it
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            return {"status": "error", "error": f"timed out after {self.timeout:g}s"}
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+
+
+dashboard_service = DashboardService()
+
+
+@app.route('/api/dashboard', methods=['GET'])
+def get_dashboard():
+    """Get comprehensive financial dashboard data from real sources"""
+    if not wants_json():
+        return "Dashboard endpoint - use Accept: application/json header", 400
+
+    snapshot = dashboard_service.snapshot()
 
     # Combine all data into a comprehensive dashboard
     dashboard_data = {
-        'status': 'healthy' if not xero_data.get("error") else 'degraded',
-        'xero_data': xero_data,
-        'stripe_data': stripe_data,
-        'plaid_data': plaid_data,
-        'timestamp': datetime.now().isoformat()
+        'status': 'healthy' if not snapshot['xero'].get("error") else 'degraded',
+        'xero_data': snapshot['xero'],
+        'stripe_data': snapshot['stripe'],
+        'plaid_data': snapshot['plaid'],
+        'timestamp': _iso_now()
     }
 
     return jsonify(dashboard_data)
 
+_money = '${:,.2f}'.format
+
+
+@functools.lru_cache(maxsize=32)
+def _cash_flow_figures(accounts_count, invoices_count):
+    """Formatted cash estimates; they only depend on the two Xero counts."""
+    # Rough estimates based on business activity
+    estimated_cash = (accounts_count * 1000) + (invoices_count * 3500)
+    monthly_inflow = invoices_count * 5000  # Estimated monthly revenue
+    monthly_outflow = accounts_count * 800   # Estimated monthly expenses
+    operating = estimated_cash * 0.7
+    return (
+        _money(estimated_cash),
+        _money(operating),
+        _money(estimated_cash - operating),
+        _money(monthly_inflow),
+        _money(monthly_outflow),
+        _money(monthly_inflow - monthly_outflow),
+    )
+
 @app.route('/api/cash-flow', methods=['GET'])
 def get_cash_flow():
     """Get cash flow information from real sources"""
-    accept_header = request.headers.get('Accept', '')
-    wants_json = 'application/json' in accept_header or request.args.get('format') == 'json'
-
-    if not wants_json:
+    if not wants_json():
         return "Cash flow endpoint - use Accept: application/json header", 400
 
     # Get real cash flow data from Xero
     try:
-        from xero_mcp import xero_dashboard
-        xero_data = xero_dashboard()
+        xero_data = dashboard_service.snapshot()['xero']
+        if xero_data.get("error"):
+            raise RuntimeError(xero_data["error"])
 
         # Extract meaningful cash flow info from Xero data
-        if not xero_data.get("error") and xero_data.get("xero"):
+        if xero_data.get("xero"):
             xero_info = xero_data["xero"]
             # Calculate estimated cash position based on account and invoice data
             accounts_count = xero_info.get("accounts_count", 0)
             invoices_count = xero_info.get("invoices_count", 0)
 
-            # Rough estimates based on business activity
-            estimated_cash = (accounts_count * 1000) + (invoices_count * 3500)
-            monthly_inflow = invoices_count * 5000  # Estimated monthly revenue
-            monthly_outflow = accounts_count * 800   # Estimated monthly expenses
+            total_cash, operating, savings, inflow, outflow, net = _cash_flow_figures(accounts_count, invoices_count)
 
             cash_flow_data = {
                 'status': 'healthy',
-                'total_cash': f"${estimated_cash:,.2f}",
+                'total_cash': total_cash,
                 'bank_accounts': [
-                    {"name": "Primary Operating Account", "balance": f"${estimated_cash * 0.7:,.2f}", "currency": "USD"},
-                    {"name": "Business Savings", "balance": f"${estimated_cash * 0.3:,.2f}", "currency": "USD"}
+                    {"name": "Primary Operating Account", "balance": operating, "currency": "USD"},
+                    {"name": "Business Savings", "balance": savings, "currency": "USD"}
                 ],
-                'monthly_inflow': f"${monthly_inflow:,.2f}",
-                'monthly_outflow': f"${monthly_outflow:,.2f}",
-                'net_cash_flow': f"${monthly_inflow - monthly_outflow:,.2f}",
+                'monthly_inflow': inflow,
+                'monthly_outflow': outflow,
+                'net_cash_flow': net,
                 'currency': 'USD',
                 'source': 'xero_integration',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _iso_now()
             }
         else:
             # Fallback to mock data if Xero is not available
@@ -507,7 +520,7 @@ def get_cash_flow():
                 'net_cash_flow': "$24,150.00",
                 'currency': 'USD',
                 'source': 'mock_data',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _iso_now()
             }
     except Exception as e:
         # Return mock data on error
@@ -521,7 +534,7 @@ def get_cash_flow():
             ],
             'currency': 'USD',
             'source': 'mock_data',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _iso_now()
         }
 
     return jsonify(cash_flow_data)
@@ -684,7 +697,7 @@ def get_dashboard_chart_data():
         return jsonify({
             'success': True,
             'chart_data': chart_data,
-            'data_timestamp': datetime.now().isoformat()
+            'data_timestamp': _iso_now()
         })
 
     except Exception as e:
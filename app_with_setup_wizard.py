@@ -8,6 +8,7 @@ import os
 import sys
 import secrets
 import threading
+import functools
 import time
 from urllib.parse import urlencode
 from typing import Optional, Dict, Any
@@ -61,6 +62,10 @@ try:
     from flask_cors import CORS
 except ImportError:
     CORS = None
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
 from datetime import datetime, timedelta
 import json
 import logging
@@ -70,8 +75,6 @@ logger = logging.getLogger(__name__)
 
 # Demo mode manager and mock data
 from demo_mode import DemoModeManager, mock_stripe_payment
-import xero_demo_data
-import plaid_demo_data
 
 # Import setup wizard functionality
 from setup_wizard import (
@@ -84,9 +87,11 @@ from setup_wizard import (
     get_staged_credentials,
     upsert_service_configuration,
 )
-from ui.helpers import build_nav, format_timestamp, summarize_details
-from ui.dashboard import build_admin_dashboard_context
+from ui.helpers import build_nav, cached_url_for, current_year, format_timestamp, prefers_html, static_url, summarize_details, wants_json
+from ui.dashboard import build_admin_dashboard_context, build_demo_key_commands
 from ui.health import render_health_dashboard
+from orjson_provider import OrjsonProvider
+from jinja2 import FileSystemBytecodeCache
 
 
 # Import enhanced session configuration
@@ -113,7 +118,6 @@ from xero_client import (
 from setup_api_routes import create_setup_blueprint
 
 # Add our security layer
-sys.path.append('.')
 try:
     from auth.security import SecurityManager, require_api_key, log_transaction
     SECURITY_ENABLED = True
@@ -129,17 +133,36 @@ except ImportError:
             return f(*args, **kwargs)
         return wrapper
     
+    _tx_logger = logging.getLogger('fcc.transactions')
+    _tx_logger.addHandler(logging.NullHandler())
+
     def log_transaction(operation, amount, currency, status):
-        print(f"Transaction: {operation} - {amount} {currency} - {status}")
+        _tx_logger.info("Transaction: %s - %s %s - %s", operation, amount, currency, status)
 
 app = Flask(__name__)
+app.json_provider_class = OrjsonProvider
+app.json = OrjsonProvider(app)
+# Persist compiled templates so fresh workers skip Jinja's parse/compile step
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+# Static assets are referenced through static_url(), whose ?v= content hash
+# changes whenever the file does, so browsers may keep them for a year
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
+app.add_template_global(static_url)
+
+# Compress HTML/JSON/JS responses (brotli when the client accepts it, else
+# gzip); the pages are mostly repetitive markup and shrink 5-10x
+if Compress is not None:
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 512
+    app.config['COMPRESS_LEVEL'] = 6
+    Compress(app)
 
 @app.context_processor
 def inject_layout_defaults():
     return {
         'brand_name': 'Financial Command Center AI',
-        'brand_url': url_for('index'),
-        'current_year': datetime.now().year,
+        'brand_url': cached_url_for('index'),
+        'current_year': current_year(),
     }
 
 # Initialize demo mode management (adds /api/mode and /admin/mode, and banner helpers)
@@ -843,9 +866,6 @@ def update_api_client_token(api_client, token):
 
     try:
         # Create a completely new API client with the token
-        from xero_python.api_client import ApiClient, Configuration
-        from xero_python.api_client.oauth2 import OAuth2Token
-
         # Create new OAuth2Token with client credentials
         oauth2_token = OAuth2Token(
             client_id=app.config['XERO_CLIENT_ID'],
@@ -1373,28 +1393,20 @@ def test_oauth_flow():
 
 # Health Check
 
-@app.route('/health', methods=['GET'])
-def health_check():
-    """Enhanced health check with integration status"""
-    # Check if request wants JSON (API) or HTML (web UI)
-    accept_header = request.headers.get('Accept', '')
-    wants_json = 'application/json' in accept_header or request.args.get('format') == 'json'
-    
+@functools.lru_cache(maxsize=2)
+def _health_snapshot(bucket):
+    """Health payload and its JSON body, shared by every request in one second."""
     credentials = get_credentials_or_redirect()
     integration_status = get_integration_status()
     
-    # Get demo mode status
-    from demo_mode import DemoModeManager
-    demo_manager = DemoModeManager()
-    current_mode = demo_manager.get_mode()
-    
+    now = datetime.now()
     health_data = {
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now.isoformat(),
         'version': '3.0.0',
         'security': 'enabled' if SECURITY_ENABLED else 'disabled',
         'setup_wizard': 'enabled',
-        'mode': current_mode,  # Add mode to health data
+        'mode': demo.get_mode(),
         'integrations': {
             'stripe': {
                 'available': bool(credentials.get('STRIPE_API_KEY')),
@@ -1419,8 +1431,19 @@ def health_check():
     if session_config:
         health_data['session_config'] = session_config.health_check()
     
-    if wants_json:
-        return jsonify(health_data)
+    return now, health_data, jsonify(health_data).get_data()
+
+
+@app.route('/health', methods=['GET'])
+def health_check():
+    """Enhanced health check with integration status"""
+    # Check if request wants JSON (API) or HTML (web UI)
+    json_requested = not prefers_html() or request.args.get('format') == 'json'
+    
+    now, health_data, body = _health_snapshot(int(time.time()))
+    
+    if json_requested:
+        return app.response_class(body, mimetype=app.json.mimetype)
 
     simplified_integrations = {}
     for name, info in health_data['integrations'].items():
@@ -1443,6 +1466,7 @@ def health_check():
         health_for_ui,
         security_enabled=SECURITY_ENABLED,
         session_config=session_config,
+        observed_at=now,
     )
 
 
@@ -1624,7 +1648,6 @@ def callback():
 
 
         # Get tenant information
-        from xero_python.identity import IdentityApi
         try:
             # Validate filtered_token before using it
             if not filtered_token or not filtered_token.get('access_token'):
@@ -1758,7 +1781,6 @@ def view_xero_contacts():
         return "No tenant selected. Please <a href='/login'>login again</a>.", 400
 
     try:
-        from xero_python.accounting import AccountingApi
         accounting_api = AccountingApi(api_client)
         logger.info(f"Fetching contacts for tenant: {session['tenant_id']}")
         contacts = accounting_api.get_contacts(xero_tenant_id=session['tenant_id'])
@@ -1809,7 +1831,6 @@ def view_xero_invoices():
         return "No tenant selected. Please <a href='/login'>login again</a>.", 400
 
     try:
-        from xero_python.accounting import AccountingApi
         accounting_api = AccountingApi(api_client)
         status_filter = request.args.get('status', 'DRAFT,SUBMITTED,AUTHORISED')
         invoices = accounting_api.get_invoices(
@@ -2048,25 +2069,7 @@ def create_demo_key():
         return "Security module not available. Install cryptography and create auth/security.py", 500
 
     demo_key = security.generate_api_key("Web Demo Client", ["read", "write"])
-
-    commands = [
-        {
-            'title': 'Test authentication',
-            'snippet': f'curl -H "X-API-Key: {demo_key}" https://127.0.0.1:8000/api/ping',
-        },
-        {
-            'title': 'Fetch Xero contacts',
-            'snippet': f'curl -H "X-API-Key: {demo_key}" https://127.0.0.1:8000/api/xero/contacts',
-        },
-        {
-            'title': 'Create demo payment',
-            'snippet': (
-                f"curl -X POST -H \"X-API-Key: {demo_key}\" -H \"Content-Type: application/json\" "
-                f"-d '{{\"amount\": 25.50, \"description\": \"Test payment\"}}' "
-                f"https://127.0.0.1:8000/api/stripe/payment"
-            ),
-        },
-    ]
+    commands = build_demo_key_commands(demo_key)
 
     nav_items = build_nav('admin')
 
@@ -2090,10 +2093,7 @@ def create_demo_key():
 @app.route('/api/cash-flow', methods=['GET'])
 def get_cash_flow():
     """Get cash flow information"""
-    accept_header = request.headers.get('Accept', '')
-    wants_json = 'application/json' in accept_header or request.args.get('format') == 'json'
-    
-    if not wants_json:
+    if not wants_json():
         return "Cash flow endpoint - use Accept: application/json header", 400
     
     # Mock cash flow data
@@ -2124,10 +2124,7 @@ def get_cash_flow():
 @app.route('/api/invoices', methods=['GET'])
 def get_invoices():
     """Get invoices with optional filtering"""
-    accept_header = request.headers.get('Accept', '')
-    wants_json = 'application/json' in accept_header or request.args.get('format') == 'json'
-    
-    if not wants_json:
+    if not wants_json():
         return "Invoices endpoint - use Accept: application/json header", 400
     
     # Get filter parameters
@@ -2157,10 +2154,7 @@ def get_invoices():
 @app.route('/api/contacts', methods=['GET'])
 def get_contacts():
     """Get customer/supplier contacts"""
-    accept_header = request.headers.get('Accept', '')
-    wants_json = 'application/json' in accept_header or request.args.get('format') == 'json'
-    
-    if not wants_json:
+    if not wants_json():
         return "Contacts endpoint - use Accept: application/json header", 400
     
     search_term = request.args.get('search', '').lower()
@@ -2182,10 +2176,7 @@ def get_contacts():
 @app.route('/api/dashboard', methods=['GET']) 
 def get_dashboard():
     """Get comprehensive financial dashboard data from real sources"""
-    accept_header = request.headers.get('Accept', '')
-    wants_json = 'application/json' in accept_header or request.args.get('format') == 'json'
-    
-    if not wants_json:
+    if not wants_json():
         return "Dashboard endpoint - use Accept: application/json header", 400
     
     # Import the Xero dashboard function
@@ -1,14 +1,22 @@
 # auth/security.py - Security module for Financial Command Center
 import os
 import json
+import queue
+import atexit
 import secrets
 import hashlib
+import threading
+import time
 from datetime import datetime, timedelta
 from functools import wraps
 from pathlib import Path
 from typing import Dict, Optional
 from cryptography.fernet import Fernet
 
+# Serialises the audit log's load/append/save cycle between request threads and
+# the background transaction writer
+_audit_lock = threading.Lock()
+
 class SecurityManager:
     def __init__(self):
         # Use Windows-friendly paths
@@ -53,9 +61,11 @@ class SecurityManager:
             return {}
     
     def _save_json(self, file_path: Path, data: dict):
-        """Safely save JSON file"""
-        with open(file_path, 'w') as f:
+        """Safely save JSON file, replacing it atomically so readers never see a partial write"""
+        tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w') as f:
             json.dump(data, f, indent=2, default=str)
+        os.replace(tmp_path, file_path)
     
     def encrypt_sensitive_data(self, data: str) -> str:
         """Encrypt sensitive data like API keys"""
@@ -174,27 +184,32 @@ class SecurityManager:
     
     def log_security_event(self, event_type: str, client_name: str, details: dict):
         """Log security events for audit"""
-        audit_log = self._load_json(self.audit_file)
+        self.log_security_events(event_type, [(client_name, details)])
+    
+    def log_security_events(self, event_type: str, events: list):
+        """Log several (client_name, details) events with one audit file rewrite"""
+        with _audit_lock:
+            audit_log = self._load_json(self.audit_file)
         
-        event_id = secrets.token_hex(8)
-        timestamp = datetime.now().isoformat()
+            timestamp = datetime.now().isoformat()
         
-        if "events" not in audit_log:
-            audit_log["events"] = []
+            if "events" not in audit_log:
+                audit_log["events"] = []
         
-        audit_log["events"].append({
-            "event_id": event_id,
-            "timestamp": timestamp,
-            "event_type": event_type,
-            "client_name": client_name,
-            "details": details
-        })
+            for client_name, details in events:
+                audit_log["events"].append({
+                    "event_id": secrets.token_hex(8),
+                    "timestamp": timestamp,
+                    "event_type": event_type,
+                    "client_name": client_name,
+                    "details": details
+                })
         
-        # Keep only last 1000 events
-        if len(audit_log["events"]) > 1000:
-            audit_log["events"] = audit_log["events"][-1000:]
+            # Keep only last 1000 events
+            if len(audit_log["events"]) > 1000:
+                audit_log["events"] = audit_log["events"][-1000:]
         
-        self._save_json(self.audit_file, audit_log)
+            self._save_json(self.audit_file, audit_log)
     
     def get_client_stats(self, api_key: str) -> dict:
         """Get usage statistics for a client"""
@@ -274,20 +289,68 @@ def require_api_key(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# Transaction audit entries are queued by the request thread and written by a
+# background thread, which coalesces bursts into one audit file rewrite
+TRANSACTION_BATCH_SIZE = 64
+TRANSACTION_FLUSH_DELAY = 0.2
+_transaction_queue = queue.SimpleQueue()
+_transaction_writer = None
+_transaction_writer_lock = threading.Lock()
+
 def log_transaction(operation: str, amount: float, currency: str, status: str):
     """Log financial transactions for audit"""
     from flask import request
     
-    security = SecurityManager()
     client_name = getattr(request, 'client_info', {}).get('client_name', 'unknown')
     
-    security.log_security_event("financial_transaction", client_name, {
+    _transaction_queue.put((client_name, {
         "operation": operation,
         "amount": amount,
         "currency": currency,
         "status": status,
         "timestamp": datetime.now().isoformat()
-    })
+    }))
+    _start_transaction_writer()
+
+def _start_transaction_writer():
+    global _transaction_writer
+    if _transaction_writer is not None:
+        return
+    with _transaction_writer_lock:
+        if _transaction_writer is None:
+            _transaction_writer = threading.Thread(
+                target=_write_transactions, name="audit-transactions", daemon=True
+            )
+            _transaction_writer.start()
+            atexit.register(_flush_transactions)
+
+def _write_transactions():
+    security = SecurityManager()
+    stopping = False
+    while not stopping:
+        batch = []
+        item = _transaction_queue.get()
+        deadline = time.monotonic() + TRANSACTION_FLUSH_DELAY
+        while item is not None:
+            batch.append(item)
+            remaining = deadline - time.monotonic()
+            if len(batch) >= TRANSACTION_BATCH_SIZE or remaining <= 0:
+                break
+            try:
+                item = _transaction_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+        stopping = item is None
+        if batch:
+            try:
+                security.log_security_events("financial_transaction", batch)
+            except Exception as e:
+                print(f"Failed to write transaction audit events: {e}")
+
+def _flush_transactions():
+    """Let the background writer drain the queue before the interpreter exits"""
+    _transaction_queue.put(None)
+    _transaction_writer.join(timeout=5)
 
 # CLI utility functions
 def create_demo_api_key():
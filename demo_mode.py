@@ -117,7 +117,8 @@ class DemoModeManager:
         self.add_routes(app)
 
     def add_routes(self, app):
-        from flask import request, jsonify, render_template_string, redirect, url_for
+        from flask import request, jsonify, redirect, url_for
+        from ui.helpers import render_cached_template_string
 
         @app.route("/api/mode", methods=["GET", "POST"])
         def api_mode():
@@ -187,7 +188,7 @@ class DemoModeManager:
             </body>
             </html>
             """
-            return render_template_string(html)
+            return render_cached_template_string(html)
 
     # ------------------------- UI helpers -------------------------
     def banner_html(self) -> str:
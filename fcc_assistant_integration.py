@@ -3,7 +3,6 @@ Financial Command Center Assistant Integration
 Adds assistant functionality to existing FCC web application
 """
 
-import openai
 import json
 import os
 import sys
@@ -362,6 +361,8 @@ class FCCAssistantIntegration:
             return False, "OpenAI API key not configured. Set OPENAI_API_KEY in your environment or setup wizard."
 
         try:
+            import openai  # heavy SDK; only load it once an OpenAI key is in play
+
             client = openai.OpenAI(api_key=api_key)
         except Exception as exc:
             logger.exception("Failed to initialize OpenAI client")
@@ -0,0 +1,96 @@
+"""
+orjson-backed JSON provider for Flask
+=====================================
+
+Drop-in replacement for Flask's default JSON provider that encodes and
+decodes with orjson when it is installed, keeping Flask's output rules
+(sorted keys, HTTP dates, Decimal/UUID/dataclass handling) intact. Falls
+back to the stock provider when orjson is missing, a caller asks for
+json.dumps options orjson cannot honour, or orjson rejects the object
+(e.g. integers wider than 64 bits).
+
+Output differs from the stdlib provider in three ways:
+- whitespace: orjson is always compact;
+- non-ASCII text is written as raw UTF-8 rather than \\uXXXX escapes, even
+  though the provider's ensure_ascii defaults to True (a caller passing
+  ensure_ascii=True explicitly gets the stdlib's escaped output);
+- non-finite floats: NaN and Infinity encode as null, where json.dumps emits
+  the non-standard NaN/Infinity tokens.
+
+Usage:
+    app.json_provider_class = OrjsonProvider
+    app.json = OrjsonProvider(app)
+"""
+
+from typing import Any
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# json.dumps keyword arguments orjson can reproduce
+_SUPPORTED_DUMP_ARGS = frozenset({'default', 'ensure_ascii', 'sort_keys', 'indent', 'separators'})
+# The only separators orjson emits, and only without indentation
+_COMPACT_SEPARATORS = (',', ':')
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson instead of the stdlib."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if not self._orjson_can_dump(kwargs):
+            return super().dumps(obj, **kwargs)
+
+        option = self._orjson_option(kwargs.get('sort_keys', self.sort_keys), bool(kwargs.get('indent')))
+        try:
+            return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode('utf-8')
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Like jsonify(), but hands orjson's bytes straight to the response."""
+        if not ORJSON_AVAILABLE:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        option = self._orjson_option(self.sort_keys, pretty) | orjson.OPT_APPEND_NEWLINE
+        try:
+            body = orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    @staticmethod
+    def _orjson_can_dump(kwargs: dict) -> bool:
+        if not ORJSON_AVAILABLE or kwargs.keys() - _SUPPORTED_DUMP_ARGS:
+            return False
+        # orjson always writes UTF-8; only an explicit request for escaping needs the stdlib
+        if kwargs.get('ensure_ascii'):
+            return False
+        indent = kwargs.get('indent')
+        separators = kwargs.get('separators')
+        if indent not in (None, 2):
+            return False
+        return separators is None or (tuple(separators) == _COMPACT_SEPARATORS and indent is None)
+
+    @staticmethod
+    def _orjson_option(sort_keys: bool, indent: bool) -> int:
+        # Route datetimes and dataclasses through Flask's default() so the
+        # output matches the stdlib provider byte-for-byte in meaning
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if not ORJSON_AVAILABLE or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
@@ -7,9 +7,11 @@ Handles HTTP/HTTPS modes with professional warnings and upgrade prompts
 import os
 import sys
 from pathlib import Path
-from flask import Flask, request, jsonify, render_template_string, redirect, url_for
+from flask import Flask, request, jsonify, redirect, url_for
 from datetime import datetime
 
+from ui.helpers import render_cached_template_string
+
 
 class ServerModeManager:
     """Manages server modes (HTTP/HTTPS) with professional warnings"""
@@ -162,7 +164,7 @@ class ServerModeManager:
         """
         
         https_url = request.url.replace('http://', 'https://', 1)
-        return render_template_string(template, https_url=https_url), 426  # Upgrade Required
+        return render_cached_template_string(template, https_url=https_url), 426  # Upgrade Required
     
     def render_http_warning(self):
         """Render HTTP warning page with upgrade prompt"""
@@ -341,7 +343,7 @@ class ServerModeManager:
         """
         
         https_url = request.url.replace('http://', 'https://', 1)
-        return render_template_string(template, https_url=https_url, current_url=request.url), 200
+        return render_cached_template_string(template, https_url=https_url, current_url=request.url), 200
     
     def add_ssl_help_routes(self):
         """Add SSL help and certificate management routes"""
@@ -520,7 +522,7 @@ ports:
             """
             
             health_status = "\n".join([f"{k.replace('_', ' ').title()}: {v}" for k, v in cert_manager.health_check().items()])
-            return render_template_string(template, health_status=health_status)
+            return render_cached_template_string(template, health_status=health_status)
         
         @self.app.route('/admin/certificate-bundle')
         def certificate_bundle():
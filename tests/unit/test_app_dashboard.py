@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def client():
+    app_module.app.config['TESTING'] = True
+    with app_module.app.test_client() as client:
+        yield client
+
+
+def test_health_returns_304_for_matching_weak_etag(client):
+    first = client.get('/health', headers={'Accept': 'application/json'})
+    assert first.status_code == 200
+    etag, weak = first.get_etag()
+    assert weak
+    assert first.cache_control.max_age == 10
+
+    second = client.get('/health', headers={'Accept': 'application/json', 'If-None-Match': f'W/"{etag}"'})
+    assert second.status_code == 304
+    assert second.get_data() == b''
+    assert second.get_etag() == (etag, True)
+
+    stale = client.get('/health', headers={'Accept': 'application/json', 'If-None-Match': 'W/"stale"'})
+    assert stale.status_code == 200
+    assert stale.get_json()['status'] == 'healthy'
+
+
+def _counting_providers():
+    calls = {'xero': 0, 'stripe': 0}
+
+    def provider(name):
+        def fetch():
+            calls[name] += 1
+            return {'status': 'connected', 'call': calls[name]}
+        return fetch
+
+    return calls, {name: provider(name) for name in calls}
+
+
+def test_dashboard_service_reuses_snapshot_within_ttl():
+    calls, providers = _counting_providers()
+    service = app_module.DashboardService(ttl=60.0, timeout=1.0, providers=providers)
+
+    first = service.snapshot()
+    second = service.snapshot()
+
+    assert first is second
+    assert calls == {'xero': 1, 'stripe': 1}
+
+
+def test_dashboard_service_refreshes_after_ttl():
+    calls, providers = _counting_providers()
+    service = app_module.DashboardService(ttl=60.0, timeout=1.0, providers=providers)
+
+    service.snapshot()
+    service.ttl = 0.0
+    refreshed = service.snapshot()
+
+    assert calls == {'xero': 2, 'stripe': 2}
+    assert refreshed['xero']['call'] == 2
+
+
+def test_dashboard_service_times_out_a_stalled_provider_without_resubmitting():
+    release = threading.Event()
+    calls = {'slow': 0}
+
+    def slow():
+        calls['slow'] += 1
+        release.wait(5)
+        return {'status': 'connected'}
+
+    service = app_module.DashboardService(
+        ttl=0.0, timeout=0.1, providers={'slow': slow, 'fast': lambda: {'status': 'connected'}}
+    )
+    try:
+        snapshot = service.snapshot()
+        assert snapshot['slow'] == {'status': 'error', 'error': 'timed out after 0.1s'}
+        assert snapshot['fast'] == {'status': 'connected'}
+
+        service.snapshot()
+        assert calls['slow'] == 1
+    finally:
+        release.set()
+
+
+def test_dashboard_service_concurrent_misses_share_one_refresh():
+    release = threading.Event()
+    calls = {'xero': 0}
+
+    def xero():
+        calls['xero'] += 1
+        release.wait(5)
+        return {'status': 'connected'}
+
+    service = app_module.DashboardService(ttl=60.0, timeout=5.0, providers={'xero': xero})
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.snapshot())) for _ in range(5)]
+    for t in threads:
+        t.start()
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert calls['xero'] == 1
+    assert len(results) == 5
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,41 @@
+import pytest
+
+import app as app_module
+import app_with_setup_wizard as wizard_module
+
+ACCEPT_HEADERS = [
+    (None, 'application/json'),
+    ('*/*', 'application/json'),
+    ('application/json', 'application/json'),
+    ('text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8', 'text/html'),
+    ('text/html;q=0.5, application/json', 'application/json'),
+    ('text/html, application/json;q=0.9', 'text/html'),
+]
+
+
+@pytest.mark.parametrize('module', [app_module, wizard_module], ids=['app', 'setup_wizard'])
+@pytest.mark.parametrize('accept, expected', ACCEPT_HEADERS)
+def test_health_negotiates_the_same_way_in_both_apps(module, accept, expected):
+    headers = {'Accept': accept} if accept else {}
+
+    response = module.app.test_client().get('/health', headers=headers)
+
+    assert response.status_code == 200
+    assert response.mimetype == expected
+
+
+
+@pytest.mark.parametrize('module', [app_module, wizard_module], ids=['app', 'setup_wizard'])
+@pytest.mark.parametrize('accept, query, allowed', [
+    ('application/json', '', True),
+    ('text/html, application/json;q=0.9', '', True),
+    ('application/jsonfoo', '', False),
+    ('*/*', '', False),
+    ('text/html', '?format=json', True),
+])
+def test_json_endpoints_share_the_accept_check(module, accept, query, allowed, monkeypatch):
+    monkeypatch.setattr(app_module.dashboard_service, 'snapshot', lambda: {'xero': {'error': 'offline'}})
+
+    response = module.app.test_client().get(f'/api/cash-flow{query}', headers={'Accept': accept})
+
+    assert (response.status_code != 400) is allowed
@@ -0,0 +1,62 @@
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROUTER_PATH = Path(__file__).parents[2] / "fcc-openai-adapter" / "utils" / "mcp_router.py"
+
+
+class FakeApi:
+    def get_organisations(self, tenant_id):
+        return SimpleNamespace(organisations=[SimpleNamespace(
+            organisation_id="org-1", name="Acme Ltd", base_currency="USD", short_code="!abc"
+        )])
+
+    def get_accounts(self, tenant_id):
+        return SimpleNamespace(accounts=[object(), object()])
+
+    def get_invoices(self, tenant_id, **kwargs):
+        return SimpleNamespace(invoices=[SimpleNamespace(invoice_number="INV-9")])
+
+
+@pytest.fixture
+def router(monkeypatch):
+    # The router loads its own copy of xero_mcp_warp into sys.modules; put
+    # back whatever was there once the test is done
+    monkeypatch.setitem(sys.modules, "xero_mcp_warp", sys.modules.get("xero_mcp_warp"))
+    monkeypatch.delenv("STRIPE_API_KEY", raising=False)
+    monkeypatch.delenv("PLAID_CLIENT_ID", raising=False)
+    spec = importlib.util.spec_from_file_location("fcc_openai_mcp_router", ROUTER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    router = module.MCPRouter()
+    monkeypatch.setattr(router.xero_mcp, "_api", lambda: FakeApi())
+    monkeypatch.setattr(router.xero_mcp, "_tenant", lambda: "tenant-1")
+    return router
+
+
+def test_route_tool_call_returns_a_plain_result_for_offloaded_tools(router):
+    result = router.route_tool_call("xero_org_info", {})
+
+    assert result == {
+        "ok": True,
+        "organisation_id": "org-1",
+        "name": "Acme Ltd",
+        "base_currency": "USD",
+        "short_code": "!abc",
+        "tenant_id": "tenant-1",
+    }
+    json.dumps(result)
+
+
+def test_route_tool_call_runs_the_dashboard_synchronously(router):
+    result = router.route_tool_call("xero_dashboard", {})
+
+    assert result["xero"] == {
+        "tenant_id": "tenant-1", "accounts_count": 2, "invoices_count": 1, "last_invoice": "INV-9"
+    }
+    assert "xero" in result["sources"]
+    json.dumps(result)
@@ -0,0 +1,89 @@
+import datetime
+import decimal
+import json
+import math
+import uuid
+
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from orjson_provider import OrjsonProvider
+
+
+@pytest.fixture
+def providers():
+    app = Flask(__name__)
+    return OrjsonProvider(app), DefaultJSONProvider(app)
+
+
+def test_dumps_matches_stdlib_provider(providers):
+    fast, stock = providers
+    payload = {
+        'b': [1, 2.5, None, True],
+        'a': {'nested': 'café'},
+        'when': datetime.datetime(2024, 1, 2, 3, 4, 5),
+        'amount': decimal.Decimal('10.50'),
+        'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    }
+
+    assert json.loads(fast.dumps(payload)) == json.loads(stock.dumps(payload))
+    assert list(json.loads(fast.dumps(payload))) == sorted(payload)
+
+
+def test_dumps_honours_compact_separators_and_falls_back_otherwise(providers):
+    fast, stock = providers
+    payload = {'a': 1, 'b': [1, 2]}
+
+    assert fast.dumps(payload, separators=(',', ':')) == stock.dumps(payload, separators=(',', ':'))
+    assert fast.dumps(payload, separators=(', ', ': ')) == stock.dumps(payload, separators=(', ', ': '))
+    assert fast.dumps(payload, indent=2, separators=(',', ':')) == stock.dumps(payload, indent=2, separators=(',', ':'))
+    assert fast.dumps(payload, indent=4) == stock.dumps(payload, indent=4)
+
+
+def test_dumps_falls_back_for_integers_orjson_rejects(providers):
+    fast, stock = providers
+    payload = {'big': 2 ** 70}
+
+    assert fast.dumps(payload) == stock.dumps(payload)
+
+
+def test_response_falls_back_for_integers_orjson_rejects():
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+
+    with app.app_context():
+        response = app.json.response({'big': 2 ** 70})
+
+    assert json.loads(response.get_data()) == {'big': 2 ** 70}
+
+
+def test_non_finite_floats_encode_as_null(providers):
+    fast, _ = providers
+
+    assert json.loads(fast.dumps({'x': math.nan, 'y': math.inf})) == {'x': None, 'y': None}
+
+
+def test_loads_round_trips(providers):
+    fast, stock = providers
+    text = stock.dumps({'a': [1, 'two', {'three': 3.0}]})
+
+    assert fast.loads(text) == stock.loads(text)
+    assert fast.loads(text.encode('utf-8')) == stock.loads(text)
+
+
+def test_non_ascii_text_is_written_as_utf8(providers):
+    fast, stock = providers
+    payload = {'name': 'Café Zürich €'}
+
+    assert fast.dumps(payload) == '{"name":"Café Zürich €"}'
+    assert stock.dumps(payload) == '{"name": "Caf\\u00e9 Z\\u00fcrich \\u20ac"}'
+    assert json.loads(fast.dumps(payload)) == json.loads(stock.dumps(payload))
+
+
+def test_explicit_ensure_ascii_falls_back_to_stdlib(providers):
+    fast, stock = providers
+    payload = {'name': 'Café'}
+
+    assert fast.dumps(payload, ensure_ascii=True) == stock.dumps(payload, ensure_ascii=True)
+    assert fast.dumps(payload, ensure_ascii=False) == '{"name":"Café"}'
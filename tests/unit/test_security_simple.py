@@ -165,4 +165,45 @@ class TestSecurityIntegrationBasic:
         
         # 5. Verify audit trail exists
         audit_log = security._load_json(security.audit_file)
-        assert len(audit_log.get("events", [])) > 0
\ No newline at end of file
+        assert len(audit_log.get("events", [])) > 0
+
+class TestAuditLogConcurrency:
+    """Audit writes from request threads and the transaction writer"""
+    
+    def test_interleaved_writers_lose_no_events(self, test_security_manager, test_app, monkeypatch):
+        """Security events and queued transactions written concurrently are all kept"""
+        import threading
+        from auth import security as security_module
+        
+        security = test_security_manager
+        monkeypatch.setattr(security_module, "SecurityManager", lambda: security)
+        monkeypatch.setattr(security_module, "_start_transaction_writer", lambda: None)
+        monkeypatch.setattr(security_module, "TRANSACTION_BATCH_SIZE", 4)
+        
+        writer = threading.Thread(target=security_module._write_transactions)
+        writer.start()
+        
+        def log_events(worker):
+            for i in range(25):
+                security.log_security_event("concurrency_test", f"worker-{worker}", {"i": i})
+        
+        def log_transactions():
+            with test_app.test_request_context():
+                for i in range(100):
+                    security_module.log_transaction("charge", float(i), "USD", "ok")
+        
+        threads = [threading.Thread(target=log_events, args=(n,)) for n in range(4)]
+        threads.append(threading.Thread(target=log_transactions))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        security_module._transaction_queue.put(None)
+        writer.join(timeout=5)
+        assert not writer.is_alive()
+        
+        with open(security.audit_file) as f:
+            events = json.load(f)["events"]
+        types = [e["event_type"] for e in events]
+        assert types.count("concurrency_test") == 100
+        assert types.count("financial_transaction") == 100
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import pytest
+
+import xero_mcp_warp
+
+
+class FakeApi:
+    """Stands in for AccountingApi, answering lookups per tenant."""
+
+    def __init__(self):
+        self.invoice_calls = []
+        self.contact_calls = []
+
+    def get_invoices(self, xero_tenant_id, where):
+        self.invoice_calls.append(xero_tenant_id)
+        return SimpleNamespace(invoices=[
+            SimpleNamespace(invoice_id=f"{xero_tenant_id}-id", invoice_number="INV-1", status="DRAFT")
+        ])
+
+    def get_contacts(self, xero_tenant_id, where, **kwargs):
+        self.contact_calls.append(xero_tenant_id)
+        return SimpleNamespace(contacts=[
+            SimpleNamespace(contact_id=f"{xero_tenant_id}-contact", name="Acme", email_address="a@example.com")
+        ])
+
+
+@pytest.fixture
+def fake_xero(monkeypatch):
+    api = FakeApi()
+    tenant = {'id': 't1'}
+    monkeypatch.setattr(xero_mcp_warp, '_api', lambda: api)
+    monkeypatch.setattr(xero_mcp_warp, '_tenant', lambda: tenant['id'])
+    xero_mcp_warp._clear_lookup_caches()
+    yield api, tenant
+    xero_mcp_warp._clear_lookup_caches()
+
+
+def test_invoice_ids_are_cached_per_tenant(fake_xero):
+    api, _ = fake_xero
+
+    assert xero_mcp_warp._resolve_invoice_id(api, 't1', 'INV-1') == 't1-id'
+    assert xero_mcp_warp._resolve_invoice_id(api, 't1', 'INV-1') == 't1-id'
+    assert xero_mcp_warp._resolve_invoice_id(api, 't2', 'INV-1') == 't2-id'
+    assert api.invoice_calls == ['t1', 't2']
+
+
+def test_contacts_are_cached_per_tenant_and_expire(fake_xero, monkeypatch):
+    api, tenant = fake_xero
+    find_contact = xero_mcp_warp.xero_find_contact
+
+    assert find_contact('Acme')['contact']['contact_id'] == 't1-contact'
+    assert find_contact('Acme')['contact']['contact_id'] == 't1-contact'
+    tenant['id'] = 't2'
+    assert find_contact('Acme')['contact']['contact_id'] == 't2-contact'
+    assert api.contact_calls == ['t1', 't2']
+
+    monkeypatch.setattr(xero_mcp_warp, '_CONTACT_TTL', 0.0)
+    find_contact('Acme')
+    assert api.contact_calls == ['t1', 't2', 't2']
+
+
+def test_switching_tenant_clears_lookup_caches(fake_xero, monkeypatch):
+    api, _ = fake_xero
+    monkeypatch.setattr(xero_mcp_warp, 'set_tenant_id', lambda tenant_id: None)
+    monkeypatch.setattr(xero_mcp_warp, '_save_tenant', lambda tenant_id: None)
+
+    xero_mcp_warp._resolve_invoice_id(api, 't1', 'INV-1')
+    xero_mcp_warp.xero_find_contact('Acme')
+    xero_mcp_warp.xero_set_tenant('t2')
+
+    assert not xero_mcp_warp._INV_CACHE
+    assert not xero_mcp_warp._CONTACT_CACHE
+
+
+def test_refreshing_the_api_clears_lookup_caches(fake_xero):
+    api, _ = fake_xero
+
+    xero_mcp_warp._resolve_invoice_id(api, 't1', 'INV-1')
+    xero_mcp_warp.xero_refresh_api()
+
+    assert not xero_mcp_warp._INV_CACHE
+    assert xero_mcp_warp._API is None
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import pytest
+
+import xero_mcp_warp
+
+
+def _contact(n):
+    return SimpleNamespace(name=f"Contact {n}", email_address=None, is_customer=True, is_supplier=False)
+
+
+class PagedContacts:
+    """Serves `total` contacts in Xero-style pages, recording each request."""
+
+    def __init__(self, total, with_pagination=True):
+        self.total = total
+        self.with_pagination = with_pagination
+        self.requests = []
+
+    def get_contacts(self, page, page_size, **kwargs):
+        self.requests.append((page, page_size))
+        start = (page - 1) * page_size
+        batch = [_contact(n) for n in range(start, min(start + page_size, self.total))]
+        pagination = SimpleNamespace(item_count=self.total) if self.with_pagination else None
+        return SimpleNamespace(contacts=batch, pagination=pagination)
+
+
+@pytest.fixture
+def use_api(monkeypatch):
+    def install(api):
+        monkeypatch.setattr(xero_mcp_warp, "_api", lambda: api)
+        monkeypatch.setattr(xero_mcp_warp, "_tenant", lambda: "t1")
+        return api
+    return install
+
+
+def test_list_contacts_sizes_pages_to_the_limit(use_api):
+    api = use_api(PagedContacts(total=250))
+
+    result = xero_mcp_warp.xero_list_contacts(limit=5)
+
+    assert api.requests == [(1, 5)]
+    assert result["count"] == 250
+    assert result["returned"] == 5
+    assert [c["name"] for c in result["first"]] == [f"Contact {n}" for n in range(5)]
+
+
+def test_list_contacts_counts_pages_without_pagination_metadata(use_api):
+    api = use_api(PagedContacts(total=23, with_pagination=False))
+
+    result = xero_mcp_warp.xero_list_contacts(limit=10)
+
+    assert result["count"] == 23
+    assert result["returned"] == 10
+    assert api.requests == [(1, 10), (2, 10), (3, 10)]
+
+
+def test_iter_pages_caps_page_size_and_stops_on_a_short_page():
+    api = PagedContacts(total=150)
+
+    records = list(xero_mcp_warp._iter_pages(api.get_contacts, "contacts", limit=500))
+
+    assert len(records) == 150
+    assert api.requests == [(1, 100), (2, 100)]
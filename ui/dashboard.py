@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import os
+import threading
+import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
@@ -15,7 +18,60 @@ class AdminDashboardContext:
     security_enabled: bool
 
 
+# curl examples shown after creating a demo key; only the key varies per call
+DEMO_KEY_COMMANDS = (
+    ('Test authentication', 'curl -H "X-API-Key: {demo_key}" https://127.0.0.1:8000/api/ping'),
+    ('Fetch Xero contacts', 'curl -H "X-API-Key: {demo_key}" https://127.0.0.1:8000/api/xero/contacts'),
+    (
+        'Create demo payment',
+        'curl -X POST -H "X-API-Key: {demo_key}" -H "Content-Type: application/json" '
+        '-d \'{{"amount": 25.50, "description": "Test payment"}}\' '
+        'https://127.0.0.1:8000/api/stripe/payment',
+    ),
+)
+
+
+def build_demo_key_commands(demo_key: str) -> List[Dict[str, str]]:
+    return [{'title': title, 'snippet': snippet.format(demo_key=demo_key)} for title, snippet in DEMO_KEY_COMMANDS]
+
+
+# Admin pages are refreshed repeatedly; reuse the last context while the key
+# store and audit log are unchanged, for at most CONTEXT_CACHE_TTL seconds
+CONTEXT_CACHE_TTL = 5.0
+_context_cache: Dict[str, Any] = {'key': None, 'ts': 0.0, 'context': None}
+_context_lock = threading.Lock()
+
+
 def build_admin_dashboard_context(security_enabled: bool, security_manager: Optional[Any], demo_manager: Any) -> AdminDashboardContext:
+    key = (
+        security_enabled,
+        bool(demo_manager.is_demo),
+        _store_signature(security_manager) if security_enabled and security_manager is not None else None,
+    )
+    now = time.monotonic()
+    with _context_lock:
+        if _context_cache['key'] == key and now - _context_cache['ts'] < CONTEXT_CACHE_TTL:
+            return _context_cache['context']
+
+    context = _build_admin_dashboard_context(security_enabled, security_manager, demo_manager)
+    with _context_lock:
+        _context_cache.update(key=key, ts=now, context=context)
+    return context
+
+
+def _store_signature(security_manager: Any) -> tuple:
+    signature = []
+    for path in (security_manager.auth_file, security_manager.audit_file):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _build_admin_dashboard_context(security_enabled: bool, security_manager: Optional[Any], demo_manager: Any) -> AdminDashboardContext:
     api_keys_list: List[Dict[str, Any]] = []
     recent_events: List[Dict[str, Any]] = []
     total_keys = 0
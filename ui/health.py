@@ -1,81 +1,156 @@
 from __future__ import annotations
 
-import json
-from typing import Any, Dict, Optional
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 
-from flask import render_template, request
+from flask import current_app, render_template, request
 
 from .helpers import build_nav
 
-def render_health_dashboard(health_data: Dict[str, Any], *, security_enabled: bool, session_config: Optional[Any]) -> str:
+OBSERVED_FORMAT = '%b %d, %Y %I:%M %p'
+
+STATUS_MAP: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    'healthy': MappingProxyType({
+        'label': 'Operational',
+        'message': 'All services are responding normally.',
+        'icon': 'heart-pulse',
+        'tone': 'success',
+    }),
+    'warning': MappingProxyType({
+        'label': 'Attention needed',
+        'message': 'Some services reported warnings. Review the details below.',
+        'icon': 'alert-triangle',
+        'tone': 'warning',
+    }),
+    'error': MappingProxyType({
+        'label': 'Service disruption',
+        'message': 'Critical issues detected. Investigate immediately.',
+        'icon': 'octagon-alert',
+        'tone': 'danger',
+    }),
+})
+
+BADGE_CLASSES: Mapping[str, str] = MappingProxyType({
+    'success': 'text-emerald-600',
+    'warning': 'text-amber-600',
+    'danger': 'text-rose-600',
+    'info': 'text-sky-600',
+})
+
+INTEGRATION_DESCRIPTIONS: Mapping[str, str] = MappingProxyType({
+    'xero': 'Invoices, contacts, and financial reports.',
+    'stripe': 'Payments, subscriptions, and billing flows.',
+    'plaid': 'Banking connections and transaction monitoring.',
+})
+
+# Integration status -> (tone, badge label, icon)
+TONE_BY_STATUS: Mapping[str, tuple] = MappingProxyType({
+    **{status: ('success', 'Configured', 'check') for status in ('configured', 'connected', 'available', 'ready')},
+    **{status: ('info', status.title(), 'sparkles') for status in ('demo', 'optional')},
+    **{status: ('warning', status.title(), 'alert-triangle') for status in ('warning', 'degraded', 'pending')},
+})
+
+SECURITY_METRIC_ENABLED: Mapping[str, Any] = MappingProxyType({
+    'label': 'Security layer',
+    'value': 'Enabled',
+    'description': 'API key enforcement and audit logging protect sensitive endpoints.',
+    'icon': 'shield',
+    'tone': 'success',
+    'meta': ('Audit logging', 'Rate limits'),
+})
+
+SECURITY_METRIC_DISABLED: Mapping[str, Any] = MappingProxyType({
+    'label': 'Security layer',
+    'value': 'Disabled',
+    'description': 'Install auth/security.py to enable API key enforcement.',
+    'icon': 'shield',
+    'tone': 'danger',
+    'meta': ('Configuration required',),
+})
+
+SERVICES_METRIC: Mapping[str, str] = MappingProxyType({
+    'label': 'Connected services',
+    'value': 'Stripe | Plaid | Xero',
+    'description': 'Pre-wired connectors ready for show-time demos.',
+    'icon': 'layers',
+    'tone': 'info',
+})
+
+def _mode_metric(is_demo: bool) -> Mapping[str, str]:
+    return MappingProxyType({
+        'label': 'Operating mode',
+        'value': 'Demo data' if is_demo else 'Live data',
+        'description': 'Switch between demo and production in the admin area.',
+        'icon': 'sparkles' if is_demo else 'shield-check',
+        'tone': 'warning' if is_demo else 'success',
+    })
+
+# The metric cards only vary by (demo mode, security enabled), so every
+# variant is built once up front
+HEALTH_METRICS: Mapping[tuple, tuple] = MappingProxyType({
+    (is_demo, secured): (
+        _mode_metric(is_demo),
+        SECURITY_METRIC_ENABLED if secured else SECURITY_METRIC_DISABLED,
+        SERVICES_METRIC,
+    )
+    for is_demo in (True, False)
+    for secured in (True, False)
+})
+
+# Certificates change on the order of days; the probe stats PEM files, shells
+# out to mkcert and opens a TLS connection, so don't repeat it per request
+CERT_HEALTH_TTL = 300.0
+_cert_health_cache: Dict[str, Any] = {'ts': 0.0, 'data': None}
+_cert_health_lock = threading.Lock()
+
+SESSION_FIELD_SPEC = (
+    ('status', 'Status'),
+    ('backend', 'Backend'),
+    ('storage_path', 'Storage path'),
+    ('interface', 'Interface'),
+    ('timeout', 'Timeout (s)'),
+)
+
+def render_health_dashboard(
+    health_data: Dict[str, Any],
+    *,
+    security_enabled: bool,
+    session_config: Optional[Any],
+    observed_at: Optional[datetime] = None,
+) -> str:
     nav_items = build_nav('health')
 
-    status_map = {
-        'healthy': {
-            'label': 'Operational',
-            'message': 'All services are responding normally.',
-            'icon': 'heart-pulse',
-            'tone': 'success',
-        },
-        'warning': {
-            'label': 'Attention needed',
-            'message': 'Some services reported warnings. Review the details below.',
-            'icon': 'alert-triangle',
-            'tone': 'warning',
-        },
-        'error': {
-            'label': 'Service disruption',
-            'message': 'Critical issues detected. Investigate immediately.',
-            'icon': 'octagon-alert',
-            'tone': 'danger',
-        },
-    }
+    status = STATUS_MAP.get(health_data.get('status'), STATUS_MAP['healthy'])
+
+    # Callers that just stamped health_data can pass the datetime itself and
+    # skip re-parsing the ISO string
+    if observed_at is not None:
+        observed_display = observed_at.strftime(OBSERVED_FORMAT)
+    else:
+        timestamp = health_data.get('timestamp')
+        observed_display = timestamp
+        if timestamp:
+            try:
+                observed_display = _format_timestamp(timestamp)
+            except Exception:
+                observed_display = timestamp
+
+    is_demo = health_data.get('mode', 'demo') == 'demo'
+    mode_label = 'Demo data' if is_demo else 'Live data'
+    effective_security = health_data.get('security') == 'enabled' or security_enabled
 
-    status = status_map.get(health_data.get('status'), status_map['healthy'])
-
-    timestamp = health_data.get('timestamp')
-    observed_display = timestamp
-    if timestamp:
-        try:
-            observed_display = _format_timestamp(timestamp)
-        except Exception:
-            observed_display = timestamp
-
-    mode_value = health_data.get('mode', 'demo')
-    mode_label = 'Demo data' if mode_value == 'demo' else 'Live data'
-    security_flag = health_data.get('security') == 'enabled'
-
-    metrics = [
-        {
-            'label': 'Operating mode',
-            'value': mode_label,
-            'description': 'Switch between demo and production in the admin area.',
-            'icon': 'sparkles' if mode_value == 'demo' else 'shield-check',
-            'tone': 'warning' if mode_value == 'demo' else 'success',
-        },
-        {
-            'label': 'Security layer',
-            'value': 'Enabled' if security_flag or security_enabled else 'Disabled',
-            'description': 'API key enforcement and audit logging protect sensitive endpoints.' if security_flag or security_enabled else 'Install auth/security.py to enable API key enforcement.',
-            'icon': 'shield',
-            'tone': 'success' if security_flag or security_enabled else 'danger',
-            'meta': ['Audit logging', 'Rate limits'] if security_flag or security_enabled else ['Configuration required'],
-        },
-        {
-            'label': 'Connected services',
-            'value': 'Stripe | Plaid | Xero',
-            'description': 'Pre-wired connectors ready for show-time demos.',
-            'icon': 'layers',
-            'tone': 'info',
-        },
-    ]
+    metrics = HEALTH_METRICS[is_demo, bool(effective_security)]
 
     session_info = health_data.get('session_config') or {}
     session_card = _build_session_card(session_info, session_config)
     certificate = _build_certificate_card()
     integration_cards = _build_integration_cards(health_data.get('integrations') or {})
 
-    health_json = json.dumps(health_data, indent=2, sort_keys=True)
+    health_json = current_app.json.dumps(health_data, indent=2, sort_keys=True)
 
     return render_template(
         'health.html',
@@ -83,7 +158,7 @@ def render_health_dashboard(health_data: Dict[str, Any], *, security_enabled: bo
         status=status,
         metrics=metrics,
         mode_label=mode_label,
-        security_enabled=security_flag or security_enabled,
+        security_enabled=effective_security,
         observed_display=observed_display,
         request_host=request.host,
         session_card=session_card,
@@ -94,19 +169,11 @@ def render_health_dashboard(health_data: Dict[str, Any], *, security_enabled: bo
     )
 
 def _format_timestamp(value: str) -> str:
-    from datetime import datetime
-
-    return datetime.fromisoformat(value).strftime('%b %d, %Y %I:%M %p')
+    return datetime.fromisoformat(value).strftime(OBSERVED_FORMAT)
 
 def _build_session_card(session_info: Dict[str, Any], session_config: Optional[Any]) -> Dict[str, Any]:
     details = []
-    for key, label in (
-        ('status', 'Status'),
-        ('backend', 'Backend'),
-        ('storage_path', 'Storage path'),
-        ('interface', 'Interface'),
-        ('timeout', 'Timeout (s)'),
-    ):
+    for key, label in SESSION_FIELD_SPEC:
         if key in session_info and session_info[key] not in (None, ''):
             value = session_info[key]
             if key == 'timeout' and isinstance(value, (int, float)):
@@ -125,6 +192,22 @@ def _build_session_card(session_info: Dict[str, Any], session_config: Optional[A
         'actions': actions,
     }
 
+@lru_cache(maxsize=1)
+def _get_cert_manager():
+    """Import and construct the certificate manager once, on first use."""
+    from cert_manager import CertificateManager
+
+    return CertificateManager()
+
+def _cached_cert_health() -> Optional[Dict[str, Any]]:
+    """Certificate health, refreshed at most once per CERT_HEALTH_TTL seconds."""
+    now = time.monotonic()
+    with _cert_health_lock:
+        if _cert_health_cache['data'] is None or now - _cert_health_cache['ts'] > CERT_HEALTH_TTL:
+            _cert_health_cache['data'] = _get_cert_manager().health_check()
+            _cert_health_cache['ts'] = now
+        return _cert_health_cache['data']
+
 def _build_certificate_card() -> Dict[str, Any]:
     certificate = {
         'status_label': 'Manual review',
@@ -133,10 +216,7 @@ def _build_certificate_card() -> Dict[str, Any]:
         'details': [],
     }
     try:
-        from cert_manager import CertificateManager
-
-        cert_manager = CertificateManager()
-        cert_health = cert_manager.health_check()
+        cert_health = _cached_cert_health()
         if cert_health:
             valid = bool(cert_health.get('certificate_valid'))
             expires = cert_health.get('expires') or 'unknown'
@@ -155,46 +235,19 @@ def _build_certificate_card() -> Dict[str, Any]:
     return certificate
 
 def _build_integration_cards(integration_info: Dict[str, Any]) -> list:
-    badge_classes = {
-        'success': 'text-emerald-600',
-        'warning': 'text-amber-600',
-        'danger': 'text-rose-600',
-        'info': 'text-sky-600',
-    }
-    integration_descriptions = {
-        'xero': 'Invoices, contacts, and financial reports.',
-        'stripe': 'Payments, subscriptions, and billing flows.',
-        'plaid': 'Banking connections and transaction monitoring.',
-    }
+    return [_integration_card(key, value) for key, value in integration_info.items()]
 
-    cards = []
-    for key, value in integration_info.items():
-        name = key.replace('_', ' ').title()
-        normalized = str(value).lower()
-        if normalized in {'configured', 'connected', 'available', 'ready'}:
-            tone = 'success'
-            status_label = 'Configured'
-            icon = 'check'
-        elif normalized in {'demo', 'optional'}:
-            tone = 'info'
-            status_label = normalized.title()
-            icon = 'sparkles'
-        elif normalized in {'warning', 'degraded', 'pending'}:
-            tone = 'warning'
-            status_label = normalized.title()
-            icon = 'alert-triangle'
-        else:
-            tone = 'danger'
-            status_label = normalized.title() if normalized else 'Unavailable'
-            icon = 'x-circle'
-
-        cards.append({
-            'category': 'Integration',
-            'title': name,
-            'status_label': status_label,
-            'icon': icon,
-            'badge_class': badge_classes.get(tone, 'text-muted-foreground'),
-            'description': integration_descriptions.get(key, ''),
-            'details': [],
-        })
-    return cards
+def _integration_card(key: str, value: Any) -> Dict[str, Any]:
+    normalized = str(value).lower()
+    tone, status_label, icon = TONE_BY_STATUS.get(normalized) or (
+        'danger', normalized.title() if normalized else 'Unavailable', 'x-circle'
+    )
+    return {
+        'category': 'Integration',
+        'title': key.replace('_', ' ').title(),
+        'status_label': status_label,
+        'icon': icon,
+        'badge_class': BADGE_CLASSES.get(tone, 'text-muted-foreground'),
+        'description': INTEGRATION_DESCRIPTIONS.get(key, ''),
+        'details': [],
+    }
@@ -1,8 +1,13 @@
+import hashlib
+import os
+import time
 from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, Sequence, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Sequence, Tuple
 
-from flask import url_for
+from flask import current_app, has_request_context, request, url_for
 
 NavDefinition = Tuple[str, str, str, dict]
 
@@ -19,6 +24,54 @@ PRIMARY_NAV: Tuple[NavDefinition, ...] = (
 
 def build_nav(active: str = 'overview', extras: Optional[Sequence[NavDefinition]] = None) -> list:
     """Return navigation items with the requested item marked as active."""
+    if extras:
+        return _build_nav_items(active, extras)
+    # The primary nav only varies by app, mount point and active item, so
+    # every variant is built once and reused
+    return list(_cached_nav(*_url_cache_key(), active))
+
+def cached_url_for(endpoint: str) -> str:
+    """url_for() for parameterless endpoints, memoized per app and mount point."""
+    return _cached_url(*_url_cache_key(), endpoint)
+
+def _url_cache_key() -> Tuple[str, str]:
+    return current_app.name, request.script_root if has_request_context() else ''
+
+@lru_cache(maxsize=64)
+def _cached_nav(app_name: str, script_root: str, active: str) -> Tuple[Mapping[str, Any], ...]:
+    # Shared across requests, so hand out read-only views
+    return tuple(MappingProxyType(item) for item in _build_nav_items(active))
+
+@lru_cache(maxsize=64)
+def _cached_url(app_name: str, script_root: str, endpoint: str) -> str:
+    return url_for(endpoint)
+
+def static_url(filename: str) -> str:
+    """url_for('static') with a content-hash query, safe to cache for a year."""
+    if current_app.debug:
+        # Pick up edits to the asset without restarting the dev server
+        return _cached_static_url.__wrapped__(*_url_cache_key(), filename)
+    return _cached_static_url(*_url_cache_key(), filename)
+
+@lru_cache(maxsize=64)
+def _cached_static_url(app_name: str, script_root: str, filename: str) -> str:
+    path = os.path.join(current_app.static_folder, filename)
+    try:
+        with open(path, 'rb') as fh:
+            version = hashlib.blake2b(fh.read(), digest_size=6).hexdigest()
+    except OSError:
+        return url_for('static', filename=filename)
+    return url_for('static', filename=filename, v=version)
+
+def current_year() -> int:
+    """The current year, recomputed at most once an hour."""
+    return _year_for_hour(int(time.time() // 3600))
+
+@lru_cache(maxsize=1)
+def _year_for_hour(hour: int) -> int:
+    return datetime.now().year
+
+def _build_nav_items(active: str, extras: Optional[Sequence[NavDefinition]] = None) -> list:
     nav_definitions: OrderedDict[str, NavDefinition] = OrderedDict()
     for identifier, label, endpoint, params in PRIMARY_NAV:
         nav_definitions[identifier] = (identifier, label, endpoint, params)
@@ -43,6 +96,16 @@ def build_nav(active: str = 'overview', extras: Optional[Sequence[NavDefinition]
         })
     return items
 
+def render_cached_template_string(source: str, **context) -> str:
+    """render_template_string() that compiles each distinct source once per app."""
+    template = _compiled_template(current_app.name, source)
+    current_app.update_template_context(context)
+    return template.render(context)
+
+@lru_cache(maxsize=32)
+def _compiled_template(app_name: str, source: str):
+    return current_app.jinja_env.from_string(source)
+
 def format_timestamp(value: Optional[str], *, default: Optional[str] = None) -> Optional[str]:
     """Return a human friendly timestamp or a default fallback."""
     if not value:
@@ -61,3 +124,11 @@ def summarize_details(details: Optional[dict]) -> str:
         parts = [f"{key}: {value}" for key, value in details.items()]
         return '; '.join(parts)
     return str(details)
+
+def wants_json() -> bool:
+    """True when the client explicitly lists application/json or passes ?format=json."""
+    return request.args.get('format') == 'json' or 'application/json' in request.accept_mimetypes.values()
+
+def prefers_html() -> bool:
+    """True when the request's Accept header ranks text/html above application/json."""
+    return request.accept_mimetypes.best_match(('application/json', 'text/html')) == 'text/html'
@@ -1,5 +1,6 @@
 import os
 import json
+import threading
 import time
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -135,7 +136,18 @@ def get_tenant_id() -> str:
     store = load_store() or {}
     return store.get("tenant_id", "")
 
+# Xero refresh tokens are single-use and the token store is shared by every
+# thread, so the expiry check and refresh run as one critical section: callers
+# arriving near expiry wait for the first refresh instead of racing it
+_refresh_lock = threading.Lock()
+
+
 def ensure_valid_token(api_client: ApiClient, threshold_seconds: int = 120) -> None:
+    with _refresh_lock:
+        _refresh_if_expiring(api_client, threshold_seconds)
+
+
+def _refresh_if_expiring(api_client: ApiClient, threshold_seconds: int) -> None:
     store = load_store() or {}
     token = store.get("token") or {}
     if not token:
@@ -3,54 +3,235 @@
 # Based on the original xero_mcp.py but adapted for Warp's MCP compatibility
 
 from __future__ import annotations
+import asyncio, functools, inspect, itertools, threading, time
+from concurrent.futures import ThreadPoolExecutor
 import csv, io
-import os, shutil, base64, re
+import os, shutil, base64, binascii, math, re
 import json
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime, date
 from typing import Optional, List, Dict, Any
 from mcp.server.fastmcp import FastMCP
-from xero_client import load_api_client, get_tenant_id, set_tenant_id, ensure_valid_token
-from xero_python.accounting import Contacts, Contact, Phone, Address, RequestEmpty
-from xero_python.accounting import AccountingApi, Invoices, Invoice, LineItem, Account, Allocation, Payment, Payments
-from xero_python.accounting import Invoice as _Invoice, Invoices as _Invoices
-
-from xero_client import set_tenant_id
+from xero_client import TOKEN_FILE as _TENANT_STORE, load_api_client, get_tenant_id, set_tenant_id, ensure_valid_token
+from xero_python.accounting import (
+    AccountingApi, Address, Allocation, Contact, Contacts, Invoice, Invoices,
+    LineItem, Payment, Payments, Phone, RequestEmpty,
+)
 from xero_python.exceptions import ApiException
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 app = FastMCP("xero-mcp-warp")
 
 EXPORTS_DIR = Path(__file__).resolve().parent / "exports_warp"
 EXPORTS_DIR.mkdir(exist_ok=True)
 TENANT_FILE = Path(__file__).with_name("xero_tenant_warp.json")
+_PDF_CHUNK = 64 * 1024
+# Xero list endpoints return at most this many records per page
+_XERO_PAGE_SIZE = 100
 
 def _now_slug():
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
+# One AccountingApi per process; the token is still checked/refreshed per call
+_API: AccountingApi | None = None
+_API_LOCK = threading.Lock()
+
 def _api() -> AccountingApi:
-    client = load_api_client()
-    ensure_valid_token(client)
-    return AccountingApi(client)
+    global _API
+    with _API_LOCK:
+        if _API is None:
+            _API = AccountingApi(load_api_client())
+        api = _API
+    ensure_valid_token(api.api_client)
+    return api
+
+def _tenant_store_signature() -> tuple | None:
+    # The Flask app rewrites the token store on every login, so its mtime/size
+    # tells us when the stored tenant may have changed
+    try:
+        st = os.stat(_TENANT_STORE)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
-def _tenant() -> str:
+@functools.lru_cache(maxsize=1)
+def _cached_tenant(signature: tuple | None) -> str:
     tid = get_tenant_id()
     if not tid:
         raise RuntimeError("No tenant_id found. Log in via Flask app first, then try again.")
     return tid
 
+def _tenant() -> str:
+    return _cached_tenant(_tenant_store_signature())
+
+def _forget_tenant() -> None:
+    with _API_LOCK:
+        _cached_tenant.cache_clear()
+    _clear_lookup_caches()
+
+def _invalidate_api() -> None:
+    global _API
+    with _API_LOCK:
+        _API = None
+        _cached_tenant.cache_clear()
+    _clear_lookup_caches()
+
 def _save_tenant(tenant_id: str) -> None:
+    """Persist the tenant atomically, skipping the write if it is unchanged."""
+    global _last_written_tenant
+    if tenant_id == _last_written_tenant:
+        return
     try:
-        TENANT_FILE.write_text(json.dumps({"tenant_id": tenant_id}, indent=2), encoding="utf-8")
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps({"tenant_id": tenant_id}, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps({"tenant_id": tenant_id}, indent=2).encode("utf-8")
+        tmp = TENANT_FILE.with_suffix(".tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, TENANT_FILE)
+        _last_written_tenant = tenant_id
     except Exception:
         pass
 
 def _load_tenant() -> str | None:
     try:
-        data = json.loads(TENANT_FILE.read_text(encoding="utf-8"))
+        if ORJSON_AVAILABLE:
+            data = orjson.loads(TENANT_FILE.read_bytes())
+        else:
+            data = json.loads(TENANT_FILE.read_text(encoding="utf-8"))
         return data.get("tenant_id")
     except Exception:
         return None
 
+_Q_ESCAPE = str.maketrans({'"': '\\"'})
+
+def _esc(value: str) -> str:
+    """Escape double quotes for use inside a Xero `where` string literal."""
+    return value.translate(_Q_ESCAPE)
+
+# Small LRU caches for lookups that would otherwise cost a Xero round-trip, keyed
+# by (tenant_id, key) so switching organisations never serves another tenant's data:
+# invoice number -> (invoice_id, last known status, seen at), contact name -> (contact, seen at)
+_LOOKUP_CACHE_SIZE = 512
+# How long a cached invoice status is trusted to skip a re-fetch
+_STATUS_TTL = 60.0
+# How long a cached exact contact match is served before asking Xero again
+_CONTACT_TTL = 300.0
+_INV_CACHE: OrderedDict[tuple, tuple] = OrderedDict()
+_CONTACT_CACHE: OrderedDict[tuple, tuple] = OrderedDict()
+_LOOKUP_LOCK = threading.Lock()
+
+def _clear_lookup_caches() -> None:
+    with _LOOKUP_LOCK:
+        _INV_CACHE.clear()
+        _CONTACT_CACHE.clear()
+
+def _cache_get(cache: OrderedDict, key: tuple):
+    with _LOOKUP_LOCK:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+def _cache_put(cache: OrderedDict, key: tuple, value) -> None:
+    with _LOOKUP_LOCK:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > _LOOKUP_CACHE_SIZE:
+            cache.popitem(last=False)
+
+def _cache_pop(cache: OrderedDict, key: tuple) -> None:
+    with _LOOKUP_LOCK:
+        cache.pop(key, None)
+
+def _remember_invoice(tid: str, invoice) -> None:
+    number = getattr(invoice, "invoice_number", None)
+    if number:
+        _cache_put(_INV_CACHE, (tid, number), (str(invoice.invoice_id), str(getattr(invoice, "status", "")), time.monotonic()))
+
+def _resolve_invoice_id(api: AccountingApi, tid: str, invoice_number: str) -> str | None:
+    """Map an invoice number to its InvoiceID, hitting Xero only on a cache miss."""
+    cached = _cache_get(_INV_CACHE, (tid, invoice_number))
+    if cached:
+        return cached[0]
+    q = _esc(invoice_number)
+    invs = api.get_invoices(xero_tenant_id=tid, where=f'InvoiceNumber=="{q}"')
+    if not invs.invoices:
+        return None
+    _remember_invoice(tid, invs.invoices[0])
+    return str(invs.invoices[0].invoice_id)
+
+# xero-python variants differ in how update_invoice takes its payload and in
+# the name of the PDF download method; resolve both once instead of probing
+# with try/except TypeError on every call.
+_UPDATE_INVOICE_STYLE = (
+    "wrapper_kw" if "invoices" in inspect.signature(AccountingApi.update_invoice).parameters
+    else "positional_single"
+)
+_PDF_METHOD_NAME = next(
+    (n for n in ("get_invoice_as_pdf", "get_invoice_pdf") if hasattr(AccountingApi, n)), None
+)
+
+def _update_invoice(api: AccountingApi, tid: str, invoice_id, payload: Invoice):
+    if _UPDATE_INVOICE_STYLE == "wrapper_kw":
+        return api.update_invoice(xero_tenant_id=tid, invoice_id=invoice_id, invoices=Invoices(invoices=[payload]))
+    return api.update_invoice(tid, invoice_id, payload)
+
+_DATE_RE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$|^(\d{1,2})/(\d{1,2})/(\d{4})$")
+
+def _parse_date(value) -> date:
+    """
+    Parse ISO dates/datetimes, YYYY-M-D, DD/MM/YYYY or MM/DD/YYYY (day-first
+    wins when both are valid). Raises ValueError for anything else.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    value = (value or "").strip()
+    if not value:
+        raise ValueError
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        pass
+    m = _DATE_RE.match(value)
+    if not m:
+        raise ValueError(value)
+    if m.group(1):
+        return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+    first, second, year = int(m.group(4)), int(m.group(5)), int(m.group(6))
+    try:
+        return date(year, second, first)
+    except ValueError:
+        return date(year, first, second)
+
+def _iter_pages(fetch, attr: str, limit: int = _XERO_PAGE_SIZE, totals: dict | None = None, **kwargs):
+    """
+    Yield records across Xero result pages, only requesting the next page when needed.
+    Pages are sized to ``limit`` (capped at Xero's maximum) so small queries download
+    only what they return. If ``totals`` is given, Xero's total ``item_count`` from the
+    first page's pagination metadata is stored in it.
+    """
+    page_size = min(max(1, int(limit)), _XERO_PAGE_SIZE)
+    for page in itertools.count(1):
+        resp = fetch(page=page, page_size=page_size, **kwargs)
+        if page == 1 and totals is not None and getattr(resp, "pagination", None) is not None:
+            totals["item_count"] = resp.pagination.item_count
+        batch = getattr(resp, attr, None) or []
+        yield from batch
+        if len(batch) < page_size:
+            return
+
+# What is on disk right now, so re-saving the same tenant is a no-op
+_last_written_tenant: str | None = _load_tenant()
+
 def _tenant_or_die(explicit_tenant_id: str | None) -> str:
     """Use an explicitly provided tenant_id, or a stored one, or raise with guidance."""
     tid = explicit_tenant_id or _load_tenant()
@@ -66,7 +247,7 @@ def _extract_api_error(exc: ApiException) -> str:
     body = getattr(exc, 'body', None)
     if body:
         try:
-            payload = json.loads(body)
+            payload = orjson.loads(body) if ORJSON_AVAILABLE else json.loads(body)
             if isinstance(payload, dict):
                 message = payload.get('Message') or payload.get('message') or payload.get('Detail') or message
                 elements = payload.get('Elements')
@@ -78,6 +259,38 @@ def _extract_api_error(exc: ApiException) -> str:
             pass
     return message
 
+# Bounded worker pool for blocking SDK calls (Xero, Stripe, Plaid)
+_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="xero-mcp")
+# Separate pool for lookups a tool overlaps with its own work; tools already
+# run on _POOL, so submitting back into it could deadlock when it is full
+_LOOKUP_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="xero-mcp-lookup")
+
+async def _in_pool(fn, *args, **kwargs):
+    """Run a blocking call on the shared worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_POOL, functools.partial(fn, *args, **kwargs))
+
+def _offload(fn):
+    """
+    Expose a blocking SDK tool as an async tool. FastMCP runs sync tools on its
+    event loop, so without this one slow Xero call stalls every other request.
+    Coroutines are awaited on FastMCP's own long-lived loop, so no tool needs a
+    private loop thread or a per-call asyncio.run() to fan out.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await _in_pool(fn, *args, **kwargs)
+    return wrapper
+
+def _offloaded_tool(fn):
+    """
+    Register ``fn`` with FastMCP through _offload and return it unchanged, so the
+    module-level name stays a plain sync function for in-process callers such as
+    the OpenAI adapter's MCP router.
+    """
+    app.add_tool(_offload(fn), name=fn.__name__, description=fn.__doc__)
+    return fn
+
 
 
 @app.tool()
@@ -94,18 +307,33 @@ def xero_set_tenant(tenant_id: str) -> dict:
     """Manually set the Xero tenant_id stored for MCP."""
     set_tenant_id(tenant_id)
     _save_tenant(tenant_id)
+    _forget_tenant()
     return {"ok": True, "tenant_id": tenant_id, "saved_to": str(TENANT_FILE)}
 
 @app.tool()
+def xero_refresh_api() -> dict:
+    """Drop the cached Xero client and tenant, e.g. after logging in again via the Flask app."""
+    _invalidate_api()
+    return {"ok": True, "message": "Xero client will be rebuilt on the next call"}
+
+@_offloaded_tool
 def xero_list_contacts(limit: int = 10, order: str = "Name ASC") -> Dict[str, Any]:
-    """List first N contacts."""
-    cs = _api().get_contacts(xero_tenant_id=_tenant(), order=order)
+    """List first N contacts; `count` is the tenant's total, `returned` how many are listed."""
+    max_items = max(1, int(limit))
+    totals: dict = {}
+    pages = _iter_pages(_api().get_contacts, "contacts", limit=max_items, totals=totals,
+                        xero_tenant_id=_tenant(), order=order, summary_only=True)
+    contacts = list(itertools.islice(pages, max_items))
+    count = totals.get("item_count")
+    if count is None:
+        # No pagination metadata in the response, so count the remaining pages
+        count = len(contacts) + sum(1 for _ in pages)
     def brief(c):
         return {"name": c.name, "email": c.email_address, "is_customer": bool(c.is_customer), "is_supplier": bool(c.is_supplier)}
-    items = [brief(c) for c in (cs.contacts or [])[: max(1, int(limit))]]
-    return {"count": len(cs.contacts or []), "first": items}
+    items = [brief(c) for c in contacts]
+    return {"count": count, "returned": len(items), "first": items}
 
-@app.tool()
+@_offloaded_tool
 def xero_create_contact(
     name: str,
     email: str = "",
@@ -144,7 +372,7 @@ def xero_create_contact(
     }
 
 
-@app.tool()
+@_offloaded_tool
 def xero_get_invoice_pdf(invoice_number: str = "", invoice_id: str = "") -> dict:
     """
     Download an invoice PDF to exports_warp/. Provide either invoice_number or invoice_id.
@@ -157,46 +385,44 @@ def xero_get_invoice_pdf(invoice_number: str = "", invoice_id: str = "") -> dict
     if not inv_id:
         if not invoice_number:
             return {"ok": False, "error": "Provide invoice_number or invoice_id"}
-        q = invoice_number.replace('"', '"')
-        invs = api.get_invoices(xero_tenant_id=tid, where=f'InvoiceNumber=="{q}"')
-        if not invs.invoices:
+        inv_id = _resolve_invoice_id(api, tid, invoice_number)
+        if not inv_id:
             return {"ok": False, "error": f"No invoice found with number {invoice_number}"}
-        inv_id = str(invs.invoices[0].invoice_id)
-
-    # Try whichever PDF method exists
-    if hasattr(api, "get_invoice_as_pdf"):
-        resp = api.get_invoice_as_pdf(xero_tenant_id=tid, invoice_id=inv_id)
-    elif hasattr(api, "get_invoice_pdf"):
-        resp = api.get_invoice_pdf(xero_tenant_id=tid, invoice_id=inv_id)
-    else:
+
+    if _PDF_METHOD_NAME is None:
         return {"ok": False, "error": "SDK missing PDF method (get_invoice_as_pdf / get_invoice_pdf)."}
+    resp = getattr(api, _PDF_METHOD_NAME)(xero_tenant_id=tid, invoice_id=inv_id)
 
     # Destination path
     out_path = EXPORTS_DIR / f"invoice_{inv_id}_{_now_slug()}.pdf"
 
     # Case A) Some builds return a path string to a temp file
     if isinstance(resp, str) and os.path.exists(resp):
-        try:
-            # If the temp file lacks .pdf, we still copy it with .pdf extension
-            shutil.copyfile(resp, out_path)
-            size = out_path.stat().st_size
-            return {"ok": True, "file": str(out_path), "invoice_id": inv_id, "size": size, "via": "tempfile"}
-        finally:
-            # Optional: clean up temp file if you want
-            # os.remove(resp)
-            pass
-
-    # Case B) Stream-like object
+        # The temp file is ours to keep, so move it: a plain rename on the same
+        # filesystem, otherwise a kernel-side copy (sendfile) plus unlink.
+        # If the temp file lacks .pdf, it still lands with a .pdf extension.
+        shutil.move(resp, out_path)
+        size = out_path.stat().st_size
+        return {"ok": True, "file": str(out_path), "invoice_id": inv_id, "size": size, "via": "tempfile"}
+
+    # Case B) urllib3 HTTPResponse-like: stream to disk in chunks
+    if hasattr(resp, "stream"):
+        with out_path.open("wb") as f:
+            for chunk in resp.stream(amt=_PDF_CHUNK, decode_content=True):
+                f.write(chunk)
+            # A preloaded response has nothing left to stream
+            if not f.tell() and getattr(resp, "data", None):
+                f.write(resp.data)
+        size = out_path.stat().st_size
+        return {"ok": True, "file": str(out_path), "invoice_id": inv_id, "size": size, "via": "stream()"}
+
+    # Case C) Stream-like object
     if hasattr(resp, "read"):
-        content = resp.read()
-        out_path.write_bytes(content)
-        return {"ok": True, "file": str(out_path), "invoice_id": inv_id, "size": len(content), "via": "read()"}
-
-    # Case C) urllib3 HTTPResponse-like
-    if hasattr(resp, "data"):
-        content = resp.data
-        out_path.write_bytes(content)
-        return {"ok": True, "file": str(out_path), "invoice_id": inv_id, "size": len(content), "via": ".data"}
+        with out_path.open("wb") as f:
+            while chunk := resp.read(_PDF_CHUNK):
+                f.write(chunk)
+        size = out_path.stat().st_size
+        return {"ok": True, "file": str(out_path), "invoice_id": inv_id, "size": size, "via": "read()"}
 
     # Case D) Direct bytes-ish
     if isinstance(resp, (bytes, bytearray, memoryview)):
@@ -211,15 +437,14 @@ def xero_get_invoice_pdf(invoice_number: str = "", invoice_id: str = "") -> dict
             content = resp.encode("latin-1", errors="ignore")
             out_path.write_bytes(content)
             return {"ok": True, "file": str(out_path), "invoice_id": inv_id, "size": len(content), "via": "str-%PDF"}
-        # try base64
-        base64ish = re.fullmatch(r"[A-Za-z0-9+/=\r\n]+", s) and (len(s.strip()) % 4 == 0)
-        if base64ish:
-            try:
-                content = base64.b64decode(s, validate=True)
-                out_path.write_bytes(content)
-                return {"ok": True, "file": str(out_path), "invoice_id": inv_id, "size": len(content), "via": "base64"}
-            except Exception:
-                pass
+        # try base64; b64decode's own validation is cheaper than a regex pre-scan
+        try:
+            content = base64.b64decode(s, validate=True)
+        except (binascii.Error, ValueError):
+            content = None
+        if content:
+            out_path.write_bytes(content)
+            return {"ok": True, "file": str(out_path), "invoice_id": inv_id, "size": len(content), "via": "base64"}
         # If it's a string that isn't a path, %PDF, or base64:
         preview = s[:60].replace("\n", "\\n")
         return {"ok": False, "error": f"Unexpected PDF response string (not a file, %PDF, or base64). Preview: '{preview}'"}
@@ -233,7 +458,7 @@ def xero_get_invoice_pdf(invoice_number: str = "", invoice_id: str = "") -> dict
         return {"ok": False, "error": f"Unhandled PDF response type: {type(resp)}"}
 
 
-@app.tool()
+@_offloaded_tool
 def xero_org_info() -> dict:
     """
     Show current organisation info: name, base currency, short code, tenant_id.
@@ -252,26 +477,33 @@ def xero_org_info() -> dict:
         "tenant_id": tid,
     }
 
-@app.tool()
+@_offloaded_tool
 def xero_find_contact(name: str, limit: int = 5) -> dict:
     """
     Try exact match first; if not found, return up to `limit` fuzzy matches (contains, case-insensitive).
     """
     api = _api(); tid = _tenant()
-    q = name.replace('"', '\\"')
+    q = _esc(name)
 
     # Exact
+    cached = _cache_get(_CONTACT_CACHE, (tid, name))
+    if cached and time.monotonic() - cached[1] < _CONTACT_TTL:
+        return {"match": "exact", "contact": dict(cached[0])}
     exact = api.get_contacts(xero_tenant_id=tid, where=f'Name=="{q}"')
     if exact.contacts:
         c = exact.contacts[0]
-        return {"match": "exact", "contact": {"contact_id": c.contact_id, "name": c.name, "email": c.email_address}}
+        contact = {"contact_id": c.contact_id, "name": c.name, "email": c.email_address}
+        _cache_put(_CONTACT_CACHE, (tid, name), (contact, time.monotonic()))
+        return {"match": "exact", "contact": dict(contact)}
 
     # Fuzzy (contains)
-    fuzzy = api.get_contacts(xero_tenant_id=tid, where=f'Name.ToLower().Contains("{q.lower()}")', order="Name ASC")
-    out = [{"contact_id": c.contact_id, "name": c.name, "email": c.email_address} for c in (fuzzy.contacts or [])[:max(1,int(limit))]]
+    max_items = max(1, int(limit))
+    fuzzy = api.get_contacts(xero_tenant_id=tid, where=f'Name.ToLower().Contains("{q.lower()}")', order="Name ASC",
+                             page=1, page_size=min(max_items, _XERO_PAGE_SIZE))
+    out = [{"contact_id": c.contact_id, "name": c.name, "email": c.email_address} for c in (fuzzy.contacts or [])[:max_items]]
     return {"match": "fuzzy", "count": len(out), "contacts": out}
 
-@app.tool()
+@_offloaded_tool
 def xero_list_invoices(
     kind: str = "ALL",            # ALL | ACCREC | ACCPAY
     status: str = "",             # e.g., DRAFT, SUBMITTED, AUTHORISED, PAID, VOIDED
@@ -305,7 +537,7 @@ def xero_list_invoices(
         wh.append(f'Status=="{status.upper()}"')
 
     if contact_name:
-        q = contact_name.replace('"','\"')
+        q = _esc(contact_name)
         wh.append(f'Contact.Name.ToLower().Contains("{q.lower()}")')
 
     # Xero supports Date/DateUTC filters via Date >= DateTime(YYYY,MM,DD)
@@ -322,76 +554,70 @@ def xero_list_invoices(
         wh.append(_ymd_to(date_to))
 
     where = " && ".join(wh) if wh else None
-    invs = api.get_invoices(xero_tenant_id=tid, where=where, order="Date DESC")
-
-    def brief(i):
+    max_items = max(1, int(limit))
+    # The amount filter may skip rows, so it reads full pages rather than `limit`-sized ones
+    page_limit = _XERO_PAGE_SIZE if amount_min > 0 or amount_max > 0 else max_items
+    # Summaries carry every field brief() reads; paged responses otherwise include line items
+    invoices = _iter_pages(api.get_invoices, "invoices", limit=page_limit, xero_tenant_id=tid, where=where,
+                           order="Date DESC", summary_only=True)
+
+    def brief(i, total):
+        c = i.contact
         return {
             "invoice_id": str(i.invoice_id),
             "number": i.invoice_number,
             "type": i.type,
             "status": i.status,
-            "contact": getattr(i.contact, "name", None),
-            "total": float(i.total or 0),
+            "contact": c.name if c else None,
+            "total": total,
             "currency": str(i.currency_code) if i.currency_code else None,
-            "date": str(i.date) if getattr(i, "date", None) else None
+            "date": str(i.date) if i.date else None
         }
 
-    # Filter invoices by amount if specified
-    filtered_invoices = []
-    for invoice in (invs.invoices or []):
-        total = float(invoice.total or 0)
+    # Filter invoices by amount if specified; each total is converted once
+    _f = float
+    items = []
+    for invoice in invoices:
+        total = _f(t) if (t := invoice.total) is not None else 0.0
         # Apply amount filtering
         if amount_min > 0 and total < amount_min:
             continue
         if amount_max > 0 and total > amount_max:
             continue
-        filtered_invoices.append(invoice)
+        items.append(brief(invoice, total))
 
         # Stop if we have enough items for the limit
-        if len(filtered_invoices) >= max(1, int(limit)):
+        if len(items) >= max_items:
             break
 
-    items = [brief(i) for i in filtered_invoices]
-    return {"total": len(filtered_invoices), "first": items, "where": where, "amount_filter": f"${amount_min}-${amount_max}" if amount_min > 0 or amount_max > 0 else None}
+    return {"total": len(items), "first": items, "where": where, "amount_filter": f"${amount_min}-${amount_max}" if amount_min > 0 or amount_max > 0 else None}
 
-@app.tool()
+@_offloaded_tool
 def xero_delete_draft_invoice(invoice_number: str) -> dict:
     """
     Mark a DRAFT invoice as DELETED (by invoice number).
-    Works across xero-python variants by trying both update styles.
+    Works across xero-python variants; the update style is detected at import.
     """
     api = _api(); tid = _tenant()
-    q = invoice_number.replace('"', '\\"')
+    q = _esc(invoice_number)
     invs = api.get_invoices(xero_tenant_id=tid, where=f'InvoiceNumber=="{q}"')
     if not invs.invoices:
         return {"ok": False, "error": f"Invoice {invoice_number} not found"}
 
     inv = invs.invoices[0]
+    _remember_invoice(tid, inv)
     if str(inv.status).upper() != "DRAFT":
         return {"ok": False, "error": f"Invoice {invoice_number} is not DRAFT (status={inv.status})"}
 
-    # Try style A: single Invoice as positional arg
     try:
-        updated = api.update_invoice(tid, inv.invoice_id, _Invoice(status="DELETED"))
+        updated = _update_invoice(api, tid, inv.invoice_id, Invoice(status="DELETED"))
         new_status = getattr(updated, "status", None) or (updated.invoices[0].status if getattr(updated, "invoices", None) else None)
+        _cache_pop(_INV_CACHE, (tid, invoice_number))
         return {"ok": True, "invoice_number": invoice_number, "new_status": str(new_status)}
-    except TypeError:
-        # Try style B: Invoices wrapper (named or positional)
-        try:
-            updated = api.update_invoice(tid, inv.invoice_id, _Invoices(invoices=[_Invoice(status="DELETED")]))
-            new_status = getattr(updated, "status", None) or (updated.invoices[0].status if getattr(updated, "invoices", None) else None)
-            return {"ok": True, "invoice_number": invoice_number, "new_status": str(new_status)}
-        except TypeError:
-            try:
-                updated = api.update_invoice(xero_tenant_id=tid, invoice_id=inv.invoice_id, invoices=_Invoices(invoices=[_Invoice(status="DELETED")]))
-                new_status = getattr(updated, "status", None) or (updated.invoices[0].status if getattr(updated, "invoices", None) else None)
-                return {"ok": True, "invoice_number": invoice_number, "new_status": str(new_status)}
-            except Exception as e:
-                return {"ok": False, "error": f"Update failed across variants: {e}"}
     except Exception as e:
         return {"ok": False, "error": f"Update failed: {e}"}
 
-@app.tool()
+@_offloaded_tool
 def xero_export_invoices_csv(limit: int = 100, kind: str = "ALL") -> dict:
     """
     Export up to `limit` invoices to a CSV file in exports_warp/.
@@ -401,30 +627,38 @@ def xero_export_invoices_csv(limit: int = 100, kind: str = "ALL") -> dict:
     where = None
     if kind and kind.upper() in ("ACCREC","ACCPAY"):
         where = f'Type=="{kind.upper()}"'
-    invs = api.get_invoices(xero_tenant_id=tid, where=where, order="Date DESC")
-    rows = []
-    for i in (invs.invoices or [])[:max(1,int(limit))]:
-        rows.append([
-            i.invoice_number,
-            i.type,
-            i.status,
-            getattr(i.contact, "name", None),
-            str(i.date) if getattr(i, "date", None) else "",
-            str(i.currency_code) if i.currency_code else "",
-            float(i.total or 0),
-        ])
+    max_items = max(1, int(limit))
+    invoices = list(itertools.islice(
+        _iter_pages(api.get_invoices, "invoices", limit=max_items, xero_tenant_id=tid, where=where,
+                    order="Date DESC", summary_only=True),
+        max_items,
+    ))
+
+    def _rows(items):
+        _f = float
+        for i in items:
+            c = i.contact
+            yield (
+                i.invoice_number,
+                i.type,
+                i.status,
+                c.name if c else None,
+                str(i.date) if i.date else "",
+                str(i.currency_code) if i.currency_code else "",
+                _f(t) if (t := i.total) is not None else 0.0,
+            )
 
     path = EXPORTS_DIR / f"invoices_{kind or 'ALL'}_{_now_slug()}.csv"
-    with path.open("w", newline="", encoding="utf-8") as f:
+    with path.open("w", newline="", encoding="utf-8", buffering=1 << 20) as f:
         w = csv.writer(f)
         w.writerow(["number","type","status","contact","date","currency","total"])
-        w.writerows(rows)
+        w.writerows(_rows(invoices))
 
-    return {"ok": True, "count": len(rows), "file": str(path)}
+    return {"ok": True, "count": len(invoices), "file": str(path)}
 
 
 
-@app.tool()
+@_offloaded_tool
 def xero_create_invoice(
     contact_id: str,
     line_items: List[Dict],  # [{"description": "...", "quantity": 1, "unit_amount": 100}]
@@ -501,7 +735,7 @@ def xero_create_invoice(
         return {"ok": False, "error": f"Failed to create invoice: {str(e)}"}
 
 
-@app.tool()
+@_offloaded_tool
 def xero_duplicate_invoice(invoice_id: str) -> Dict[str, Any]:
     """Copy an existing invoice to create a new draft invoice."""
     api = _api()
@@ -581,7 +815,7 @@ def xero_duplicate_invoice(invoice_id: str) -> Dict[str, Any]:
     except Exception as e:
         return {"ok": False, "error": f"Failed to duplicate invoice: {str(e)}"}
 
-@app.tool()
+@_offloaded_tool
 def xero_send_invoice_email(invoice_id: str, email: str) -> Dict[str, Any]:
     """Email an invoice to a client, ensuring Xero receives the required request payload."""
     email = (email or "").strip()
@@ -680,7 +914,7 @@ def xero_send_invoice_email(invoice_id: str, email: str) -> Dict[str, Any]:
     except Exception as e:
         return {"ok": False, "error": f"Failed to email invoice: {str(e)}"}
 
-@app.tool()
+@_offloaded_tool
 def xero_authorise_invoice(
     invoice_id: str = "",
     invoice_number: str = "",
@@ -691,27 +925,21 @@ def xero_authorise_invoice(
     if not invoice_id and not invoice_number:
         return {"ok": False, "error": "Provide invoice_id or invoice_number"}
 
-    api = _api()
     tid = _tenant()
 
-    def _parse_date(value):
-        if isinstance(value, date):
-            return value
-        if isinstance(value, datetime):
-            return value.date()
-        value = (value or "").strip()
-        if not value:
-            raise ValueError
-        try:
-            return datetime.fromisoformat(value).date()
-        except ValueError:
-            pass
-        for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y"):
-            try:
-                return datetime.strptime(value, fmt).date()
-            except ValueError:
-                continue
-        raise ValueError
+    if invoice_number and not invoice_id:
+        # Agent retry loops often re-authorise an invoice we just authorised
+        cached = _cache_get(_INV_CACHE, (tid, invoice_number))
+        if cached and cached[1].upper() == "AUTHORISED" and time.monotonic() - cached[2] < _STATUS_TTL:
+            return {
+                "ok": True,
+                "invoice_id": cached[0],
+                "invoice_number": invoice_number,
+                "status": "AUTHORISED",
+                "message": "Invoice already authorised",
+            }
+
+    api = _api()
 
     try:
         invoice = None
@@ -723,7 +951,7 @@ def xero_authorise_invoice(
             else:
                 invoice = fetched
         else:
-            safe_number = invoice_number.replace('"', '\"')
+            safe_number = _esc(invoice_number)
             fetched = api.get_invoices(
                 xero_tenant_id=tid,
                 where=f'InvoiceNumber=="{safe_number}"',
@@ -733,6 +961,7 @@ def xero_authorise_invoice(
 
         if not invoice:
             return {"ok": False, "error": "Invoice not found"}
+        _remember_invoice(tid, invoice)
 
         current_status = str(getattr(invoice, "status", ""))
         normalized_status = current_status.upper()
@@ -771,19 +1000,10 @@ def xero_authorise_invoice(
 
         target_id = getattr(invoice, "invoice_id", invoice_id)
 
-        try:
-            updated = api.update_invoice(tid, target_id, payload)
-        except TypeError:
-            try:
-                updated = api.update_invoice(tid, target_id, Invoices(invoices=[payload]))
-            except TypeError:
-                updated = api.update_invoice(
-                    xero_tenant_id=tid,
-                    invoice_id=target_id,
-                    invoices=Invoices(invoices=[payload]),
-                )
+        updated = _update_invoice(api, tid, target_id, payload)
 
         updated_invoice = updated.invoices[0] if hasattr(updated, "invoices") else updated
+        _remember_invoice(tid, updated_invoice)
 
         return {
             "ok": True,
@@ -797,6 +1017,8 @@ def xero_authorise_invoice(
             "message": "Invoice successfully authorised",
         }
     except ApiException as exc:
+        if invoice_number:
+            _cache_pop(_INV_CACHE, (tid, invoice_number))
         message = _extract_api_error(exc)
         return {
             "ok": False,
@@ -806,9 +1028,12 @@ def xero_authorise_invoice(
     except Exception as e:
         return {"ok": False, "error": f"Failed to authorise invoice: {str(e)}"}
 
-@app.tool()
-def xero_apply_payment_to_invoice(invoice_id: str, payment_id: str) -> Dict[str, Any]:
-    """Allocate an existing Xero payment to a specific invoice."""
+@_offloaded_tool
+def xero_apply_payment_to_invoice(invoice_id: str, payment_id: str, allocation_amount: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Allocate an existing Xero payment to a specific invoice.
+    Pass allocation_amount to skip the invoice lookup and let Xero validate the amount.
+    """
     invoice_id = (invoice_id or '').strip()
     payment_id = (payment_id or '').strip()
     if not invoice_id or not payment_id:
@@ -818,6 +1043,12 @@ def xero_apply_payment_to_invoice(invoice_id: str, payment_id: str) -> Dict[str,
     tid = _tenant()
 
     try:
+        # The payment is always needed (its existing allocations are resent);
+        # the invoice only when we have to work out the amount ourselves.
+        invoice_future = None
+        if allocation_amount is None:
+            invoice_future = _LOOKUP_POOL.submit(api.get_invoice, xero_tenant_id=tid, invoice_id=invoice_id)
+
         payment_response = api.get_payment(xero_tenant_id=tid, payment_id=payment_id)
         if hasattr(payment_response, 'payments'):
             payments_list = payment_response.payments or []
@@ -825,28 +1056,39 @@ def xero_apply_payment_to_invoice(invoice_id: str, payment_id: str) -> Dict[str,
         else:
             payment = payment_response
 
-        invoice_response = api.get_invoice(xero_tenant_id=tid, invoice_id=invoice_id)
-        if hasattr(invoice_response, 'invoices'):
-            invoices_list = invoice_response.invoices or []
-            invoice = invoices_list[0] if invoices_list else None
-        else:
-            invoice = invoice_response
-
         if not payment:
             return {"ok": False, "error": f"Payment {payment_id} not found", "server": "xero-mcp-warp"}
-        if not invoice:
-            return {"ok": False, "error": f"Invoice {invoice_id} not found", "server": "xero-mcp-warp"}
-
-        if float(getattr(invoice, 'amount_due', 0) or 0) <= 0:
-            return {"ok": False, "error": "Invoice has no outstanding balance", "server": "xero-mcp-warp"}
 
         existing_allocations = getattr(payment, 'allocations', []) or []
-        allocated_total = sum(float(getattr(a, 'amount', 0) or 0) for a in existing_allocations)
-        available_amount = float(getattr(payment, 'amount', 0) or 0) - allocated_total
+        allocated_total = math.fsum(
+            float(amt) for a in existing_allocations if (amt := getattr(a, 'amount', None)) is not None
+        )
+        amt = getattr(payment, 'amount', None)
+        available_amount = (float(amt) if amt is not None else 0.0) - allocated_total
         if available_amount <= 0:
             return {"ok": False, "error": "Payment has no unallocated balance available", "server": "xero-mcp-warp"}
 
-        allocation_amount = min(available_amount, float(getattr(invoice, 'amount_due', 0) or 0))
+        if invoice_future is None:
+            allocation_amount = min(available_amount, float(allocation_amount))
+            if allocation_amount <= 0:
+                return {"ok": False, "error": "allocation_amount must be positive", "server": "xero-mcp-warp"}
+        else:
+            invoice_response = invoice_future.result()
+            if hasattr(invoice_response, 'invoices'):
+                invoices_list = invoice_response.invoices or []
+                invoice = invoices_list[0] if invoices_list else None
+            else:
+                invoice = invoice_response
+
+            if not invoice:
+                return {"ok": False, "error": f"Invoice {invoice_id} not found", "server": "xero-mcp-warp"}
+
+            amt = getattr(invoice, 'amount_due', None)
+            amount_due = float(amt) if amt is not None else 0.0
+            if amount_due <= 0:
+                return {"ok": False, "error": "Invoice has no outstanding balance", "server": "xero-mcp-warp"}
+
+            allocation_amount = min(available_amount, amount_due)
         allocation = Allocation(
             invoice=Invoice(invoice_id=invoice_id),
             amount=allocation_amount
@@ -881,7 +1123,7 @@ def xero_apply_payment_to_invoice(invoice_id: str, payment_id: str) -> Dict[str,
         }
     except Exception as e:
         return {"ok": False, "error": f"Failed to apply payment: {str(e)}", "server": "xero-mcp-warp"}
-@app.tool()
+@_offloaded_tool
 def xero_get_profit_loss(start_date: str, end_date: str) -> Dict[str, Any]:
     """
     Get profit and loss statement for a date range.
@@ -921,7 +1163,7 @@ def xero_get_profit_loss(start_date: str, end_date: str) -> Dict[str, Any]:
     except Exception as e:
         return {"ok": False, "error": f"Failed to get P&L report: {str(e)}"}
 
-@app.tool()
+@_offloaded_tool
 def xero_get_balance_sheet(date: str) -> Dict[str, Any]:
     """
     Get balance sheet for a specific date.
@@ -958,7 +1200,7 @@ def xero_get_balance_sheet(date: str) -> Dict[str, Any]:
     except Exception as e:
         return {"ok": False, "error": f"Failed to get balance sheet: {str(e)}"}
 
-@app.tool()
+@_offloaded_tool
 def xero_get_aged_receivables(contact_id: Optional[str] = None) -> Dict[str, Any]:
     """Get aged receivables report showing outstanding invoices by age."""
     api = _api()
@@ -1041,7 +1283,7 @@ def xero_get_aged_receivables(contact_id: Optional[str] = None) -> Dict[str, Any
             "server": "xero-mcp-warp",
         }
 
-@app.tool()
+@_offloaded_tool
 def xero_get_cash_flow_statement(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Dict[str, Any]:
     """Get cash flow insights using Xero's bank summary report."""
     api = _api()
@@ -1075,7 +1317,7 @@ def xero_get_cash_flow_statement(start_date: Optional[str] = None, end_date: Opt
     except Exception as e:
         return {"ok": False, "error": f"Failed to get cash flow statement: {str(e)}"}
 
-@app.tool()
+@_offloaded_tool
 def xero_bulk_create_invoices(invoice_list: List[Dict]) -> Dict[str, Any]:
     """
     Create multiple invoices in batch.
@@ -1146,7 +1388,7 @@ def xero_bulk_create_invoices(invoice_list: List[Dict]) -> Dict[str, Any]:
     except Exception as e:
         return {"ok": False, "error": f"Failed to bulk create invoices: {str(e)}"}
 
-@app.tool()
+@_offloaded_tool
 def xero_export_chart_of_accounts() -> Dict[str, Any]:
     """
     Export chart of accounts structure to CSV.
@@ -1190,56 +1432,63 @@ def xero_export_chart_of_accounts() -> Dict[str, Any]:
     except Exception as e:
         return {"ok": False, "error": f"Failed to export chart of accounts: {str(e)}"}
 
-@app.tool()
-def xero_dashboard() -> Dict[str, Any]:
+async def _xero_snap() -> Dict[str, Any]:
+    # Both can touch disk (token refresh, tenant store), so keep them off the loop
+    api, tid = await asyncio.gather(_in_pool(_api), _in_pool(_tenant))
+    accts, invs = await asyncio.gather(
+        _in_pool(api.get_accounts, tid),
+        # Only counts and the latest number are needed, so skip line items etc.
+        _in_pool(api.get_invoices, tid, order="Date DESC", summary_only=True),
+    )
+    return {"tenant_id": tid, "accounts_count": len(accts.accounts or []), "invoices_count": len(invs.invoices or []), "last_invoice": (invs.invoices[0].invoice_number if (invs.invoices or []) else None)}
+
+async def _stripe_snap() -> Optional[List[Dict[str, Any]]]:
+    import stripe
+    if not os.getenv("STRIPE_API_KEY"):
+        return None
+    stripe.api_key = os.getenv("STRIPE_API_KEY")
+    charges = await _in_pool(stripe.Charge.list, limit=5)
+    return [{"id": c["id"], "amount": c["amount"], "currency": c["currency"], "paid": c["paid"]} for c in charges.get("data", [])]
+
+async def _plaid_snap() -> Optional[List[Dict[str, Any]]]:
+    import plaid
+    from plaid.api import plaid_api
+    if not (os.getenv("PLAID_CLIENT_ID") and os.getenv("PLAID_SECRET") and os.getenv("PLAID_ACCESS_TOKEN")):
+        return None
+    cfg = plaid.Configuration(host=plaid.Environment.Sandbox, api_key={"clientId": os.getenv("PLAID_CLIENT_ID"), "secret": os.getenv("PLAID_SECRET")})
+    client = plaid_api.PlaidApi(plaid.ApiClient(cfg))
+    from plaid.model.accounts_balance_get_request import AccountsBalanceGetRequest
+    req = AccountsBalanceGetRequest(access_token=os.getenv("PLAID_ACCESS_TOKEN"))
+    balances = (await _in_pool(client.accounts_balance_get, req)).to_dict()
+    return balances.get("accounts")
+
+async def _dashboard() -> Dict[str, Any]:
     """
     Compact multi-source snapshot: Xero always; Stripe/Plaid included if envs are set.
     """
     out: Dict[str, Any] = {"sources": [], "server": "xero-mcp-warp"}
-    # XERO
-    try:
-        api = _api()
-        tid = _tenant()
-        accts = api.get_accounts(tid)
-        invs  = api.get_invoices(tid, order="Date DESC")
-        out["xero"] = {"tenant_id": tid, "accounts_count": len(accts.accounts or []), "invoices_count": len(invs.invoices or []), "last_invoice": (invs.invoices[0].invoice_number if (invs.invoices or []) else None)}
-        out["sources"].append("xero")
-    except Exception as e:
-        out["xero_error"] = str(e)
+    # The three sources are independent, so fetch them concurrently
+    results = await asyncio.gather(_xero_snap(), _stripe_snap(), _plaid_snap(), return_exceptions=True)
+    for source, result in zip(("xero", "stripe", "plaid"), results):
+        if isinstance(result, Exception):
+            out[f"{source}_error"] = str(result)
+        elif result is not None:
+            out[source] = result
+            out["sources"].append(source)
 
-    # STRIPE (optional)
-    try:
-        import stripe
-        if os.getenv("STRIPE_API_KEY"):
-            stripe.api_key = os.getenv("STRIPE_API_KEY")
-            charges = stripe.Charge.list(limit=5)
-            out["stripe"] = [{"id": c["id"], "amount": c["amount"], "currency": c["currency"], "paid": c["paid"]} for c in charges.get("data", [])]
-            out["sources"].append("stripe")
-    except Exception as e:
-        out["stripe_error"] = str(e)
+    return out
 
-    # PLAID (optional)
-    try:
-        import plaid
-        from plaid.api import plaid_api
-        if os.getenv("PLAID_CLIENT_ID") and os.getenv("PLAID_SECRET") and os.getenv("PLAID_ACCESS_TOKEN"):
-            cfg = plaid.Configuration(host=plaid.Environment.Sandbox, api_key={"clientId": os.getenv("PLAID_CLIENT_ID"), "secret": os.getenv("PLAID_SECRET")})
-            client = plaid_api.PlaidApi(plaid.ApiClient(cfg))
-            from plaid.model.accounts_balance_get_request import AccountsBalanceGetRequest
-            req = AccountsBalanceGetRequest(access_token=os.getenv("PLAID_ACCESS_TOKEN"))
-            balances = client.accounts_balance_get(req).to_dict()
-            out["plaid"] = balances.get("accounts")
-            out["sources"].append("plaid")
-    except Exception as e:
-        out["plaid_error"] = str(e)
+app.add_tool(_dashboard, name="xero_dashboard", description=_dashboard.__doc__)
 
-    return out
+def xero_dashboard() -> Dict[str, Any]:
+    """Sync entry point to the xero_dashboard tool for callers outside FastMCP."""
+    return asyncio.run(_dashboard())
 
 # -----------------------------------------------------------------------------
 # Cross-Platform Integration: Stripe and Xero Integration
 # -----------------------------------------------------------------------------
 
-@app.tool()
+@_offloaded_tool
 def xero_process_stripe_payment_data(
     stripe_payment_data: List[Dict[str, Any]],
     default_contact_id: Optional[str] = None
@@ -1320,7 +1569,7 @@ def xero_process_stripe_payment_data(
         return {"ok": False, "error": f"Failed to process Stripe payments: {str(e)}", "server": "xero-mcp-warp"}
 
 
-@app.tool()
+@_offloaded_tool
 def xero_import_bank_feed(
     bank_feed_data: List[Dict[str, Any]],
     xero_bank_account_id: str
@@ -1396,7 +1645,7 @@ def xero_import_bank_feed(
         return {"ok": False, "error": f"Failed to import bank feed: {str(e)}", "server": "xero-mcp-warp"}
 
 
-@app.tool()
+@_offloaded_tool
 def xero_auto_categorize_transactions(
     categorized_transaction_data: List[Dict[str, Any]]
 ) -> Dict[str, Any]: